@@ -0,0 +1,134 @@
+"""
+Скомпилированные (Numba) ядра алгоритма муравьиной колонии
+
+Модуль импортируется решателем только при выборе backend='numba'; если Numba
+не установлена, импорт завершается ошибкой ImportError, и решатель
+возвращается к реализации на NumPy.
+
+Ядра повторяют алгоритмы NumPy-реализации и используют те же случайные числа,
+поэтому при одинаковом зерне оба варианта строят одинаковые маршруты.
+"""
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True)
+def _pick(cumulative, count, total, u):
+    """Индекс первого элемента, накопленная сумма которого больше порога"""
+    # Порог строго меньше суммы, чтобы не выбрать город с нулевым весом
+    threshold = min(u * total, np.nextafter(total, 0.0))
+    for index in range(count):
+        if cumulative[index] > threshold:
+            return index
+    return count - 1
+
+@njit(cache=True)
+def _build_ant_tour(choice_info, candidates, start, uniforms, path, visited, cumulative):
+    """Построение маршрута одного муравья в массив path"""
+    n_cities = choice_info.shape[0]
+    k = candidates.shape[1]
+    visited[:] = False
+    current = start
+    path[0] = current
+    visited[current] = True
+
+    for step in range(1, n_cities):
+        u = uniforms[step]
+        next_city = -1
+
+        # Выбор среди непосещенных кандидатов текущего города
+        if k > 0:
+            total = 0.0
+            for index in range(k):
+                city = candidates[current, index]
+                if not visited[city]:
+                    total += choice_info[current, city]
+                cumulative[index] = total
+            if total > 0:
+                next_city = candidates[current, _pick(cumulative, k, total, u)]
+
+        # Кандидаты исчерпаны (или не заданы) - просматриваем все города
+        if next_city < 0:
+            total = 0.0
+            for city in range(n_cities):
+                if not visited[city]:
+                    total += choice_info[current, city]
+                cumulative[city] = total
+            # Если все веса равны 0, выбираем равновероятно среди непосещенных
+            if total <= 0:
+                total = 0.0
+                for city in range(n_cities):
+                    if not visited[city]:
+                        total += 1.0
+                    cumulative[city] = total
+            next_city = _pick(cumulative, n_cities, total, u)
+
+        path[step] = next_city
+        visited[next_city] = True
+        current = next_city
+
+@njit(cache=True, parallel=True)
+def build_tours(choice_info, candidates, starts, uniforms):
+    """
+    Построение маршрутов группой муравьев (муравьи строятся параллельно в потоках)
+
+    Args:
+        choice_info: привлекательность переходов tau^alpha * eta^beta
+        candidates: списки кандидатов формы (n_cities, k); k = 0 - без кандидатов
+        starts: стартовые города муравьев, форма (n_ants,)
+        uniforms: равномерные случайные числа формы (n_ants, n_cities)
+
+    Returns:
+        матрица маршрутов формы (n_ants, n_cities)
+    """
+    n_ants = starts.shape[0]
+    n_cities = choice_info.shape[0]
+    paths = np.empty((n_ants, n_cities), dtype=np.intp)
+    for ant in prange(n_ants):
+        _build_ant_tour(
+            choice_info, candidates, starts[ant], uniforms[ant], paths[ant],
+            np.zeros(n_cities, dtype=np.bool_), np.empty(n_cities)
+        )
+    return paths
+
+@njit(cache=True)
+def build_tours_serial(choice_info, candidates, starts, uniforms):
+    """
+    Построение маршрутов группой муравьев в одном потоке.
+    Используется в процессах-работниках, где параллельность уже обеспечена пулом
+    """
+    n_ants = starts.shape[0]
+    n_cities = choice_info.shape[0]
+    paths = np.empty((n_ants, n_cities), dtype=np.intp)
+    visited = np.zeros(n_cities, dtype=np.bool_)
+    cumulative = np.empty(n_cities)
+    for ant in range(n_ants):
+        _build_ant_tour(choice_info, candidates, starts[ant], uniforms[ant], paths[ant], visited, cumulative)
+    return paths
+
+@njit(cache=True, parallel=True)
+def tour_lengths(distances, paths):
+    """Длины замкнутых маршрутов для матрицы маршрутов"""
+    n_ants, n_cities = paths.shape
+    lengths = np.empty(n_ants)
+    for ant in prange(n_ants):
+        total = 0.0
+        for i in range(n_cities):
+            total += distances[paths[ant, i], paths[ant, (i + 1) % n_cities]]
+        lengths[ant] = total
+    return lengths
+
+@njit(cache=True)
+def deposit_pheromone(pheromone, paths, amounts):
+    """
+    Симметричное добавление феромона на ребра маршрутов
+
+    Порядок сложений совпадает с np.add.at в NumPy-реализации:
+    сначала прямые ребра всех маршрутов, затем обратные.
+    """
+    n_ants, n_cities = paths.shape
+    for ant in range(n_ants):
+        for i in range(n_cities):
+            pheromone[paths[ant, i], paths[ant, (i + 1) % n_cities]] += amounts[ant]
+    for ant in range(n_ants):
+        for i in range(n_cities):
+            pheromone[paths[ant, (i + 1) % n_cities], paths[ant, i]] += amounts[ant]
@@ -1,9 +1,91 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import time
 from ant_colony_tsp import AntColonyTSP
 
-def analyze_ants_impact(distances, parameters):
-    """Анализ влияния количества муравьев на сходимость алгоритма"""
+# Матрица расстояний процесса-работника (передается один раз при запуске процесса)
+_sweep_distances = None
+
+def _init_sweep_worker(distances):
+    """Инициализация процесса-работника перебора параметров"""
+    global _sweep_distances
+    _sweep_distances = distances
+
+def _run_configuration(configuration, n_iterations):
+    """Запуск алгоритма с одним набором параметров, возвращает кривую сходимости"""
+    aco = AntColonyTSP(
+        distances=_sweep_distances,
+        n_ants=int(configuration['n_ants']),
+        n_iterations=n_iterations,
+        decay=configuration['decay'],
+        alpha=configuration['alpha'],
+        beta=configuration['beta'],
+        strategy=configuration.get('strategy', 'as')
+    )
+    
+    # Для кривой сходимости нужна только длина лучшего маршрута - феромоны не копируются
+    return [state.best_distance for state in aco.iterate()]
+
+def run_parameter_sweep(distances, configurations, n_iterations, workers=None, on_result=None):
+    """
+    Параллельный запуск алгоритма для списка наборов параметров
+    
+    Args:
+        distances: матрица расстояний между городами
+        configurations: список словарей с ключами n_ants, decay, alpha, beta
+            (и необязательным strategy - стратегией обновления феромонов)
+        n_iterations: количество итераций каждого запуска
+        workers: количество процессов (по умолчанию - число ядер)
+        on_result: функция on_result(index, convergence), вызываемая по мере
+            завершения каждого набора параметров
+    
+    Returns:
+        список кривых сходимости в порядке наборов параметров
+    """
+    convergence_data = [None] * len(configurations)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(configurations)))
+    
+    # Процессы запускаются заново, а не через fork (см. ParallelAntColonyTSP.iterate)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_sweep_worker,
+        initargs=(distances,)
+    ) as pool:
+        futures = {
+            pool.submit(_run_configuration, configuration, n_iterations): index
+            for index, configuration in enumerate(configurations)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            convergence_data[index] = future.result()
+            if on_result:
+                on_result(index, convergence_data[index])
+    
+    return convergence_data
+
+def run_analysis(distances, parameters, configurations, workers=None, on_result=None):
+    """Перебор наборов параметров в формате (итерации, кривые сходимости, подписи)"""
+    n_iterations = int(parameters['n_iterations'])
+    convergence_data = run_parameter_sweep(distances, configurations, n_iterations, workers, on_result)
+    return list(range(n_iterations)), convergence_data, [c['label'] for c in configurations]
+
+def _configuration(parameters, label, **overrides):
+    """Набор параметров на основе базовых с заменой отдельных значений"""
+    configuration = {
+        'n_ants': int(parameters['n_ants']),
+        'decay': parameters['decay'],
+        'alpha': parameters['alpha'],
+        'beta': parameters['beta'],
+        'label': label
+    }
+    configuration.update(overrides)
+    return configuration
+
+def ants_impact_configurations(parameters):
+    """Наборы параметров для анализа влияния количества муравьев"""
     base_ants = int(parameters['n_ants'])
     # Создаем 5 значений: -60%, -30%, базовое, +30%, +60% от базового
     n_ants_values = [
@@ -15,38 +97,10 @@ def analyze_ants_impact(distances, parameters):
     ]
     n_ants_values = sorted(list(set(n_ants_values)))  # Убираем дубликаты и сортируем
     
-    iterations = list(range(int(parameters['n_iterations'])))
-    convergence_data = []
-    
-    for n_ants in n_ants_values:
-        aco = AntColonyTSP(
-            distances=distances,
-            n_ants=n_ants,
-            n_iterations=int(parameters['n_iterations']),
-            decay=parameters['decay'],
-            alpha=parameters['alpha'],
-            beta=parameters['beta'],
-            delay=0
-        )
-        
-        best_distances = []
-        current_best = float('inf')
-        
-        def iteration_callback(iteration, pheromone, paths, distances, current_best_info):
-            nonlocal current_best
-            if current_best_info[1] < current_best:
-                current_best = current_best_info[1]
-            best_distances.append(current_best)
-        
-        aco.on_iteration = iteration_callback
-        aco.solve()
-        
-        convergence_data.append(best_distances)
-    
-    return iterations, convergence_data, [f"Муравьев: {n}" for n in n_ants_values]
+    return [_configuration(parameters, f"Муравьев: {n}", n_ants=n) for n in n_ants_values]
 
-def analyze_decay_impact(distances, parameters):
-    """Анализ влияния коэффициента испарения на сходимость алгоритма"""
+def decay_impact_configurations(parameters):
+    """Наборы параметров для анализа влияния коэффициента испарения"""
     base_decay = parameters['decay']
     
     # Адаптивно определяем шаг изменения параметра
@@ -100,38 +154,10 @@ def analyze_decay_impact(distances, parameters):
         new_value = decay_values[insert_pos] + max_gap / 2
         decay_values.insert(insert_pos + 1, new_value)
     
-    iterations = list(range(int(parameters['n_iterations'])))
-    convergence_data = []
-    
-    for decay in decay_values:
-        aco = AntColonyTSP(
-            distances=distances,
-            n_ants=int(parameters['n_ants']),
-            n_iterations=int(parameters['n_iterations']),
-            decay=decay,
-            alpha=parameters['alpha'],
-            beta=parameters['beta'],
-            delay=0
-        )
-        
-        best_distances = []
-        current_best = float('inf')
-        
-        def iteration_callback(iteration, pheromone, paths, distances, current_best_info):
-            nonlocal current_best
-            if current_best_info[1] < current_best:
-                current_best = current_best_info[1]
-            best_distances.append(current_best)
-        
-        aco.on_iteration = iteration_callback
-        aco.solve()
-        
-        convergence_data.append(best_distances)
-    
-    return iterations, convergence_data, [f"Испарение: {d:.2f}" for d in decay_values]
+    return [_configuration(parameters, f"Испарение: {d:.2f}", decay=d) for d in decay_values]
 
-def analyze_alpha_impact(distances, parameters):
-    """Анализ влияния параметра alpha на сходимость алгоритма"""
+def alpha_impact_configurations(parameters):
+    """Наборы параметров для анализа влияния параметра alpha"""
     base_alpha = parameters['alpha']
     # Создаем 5 значений: -60%, -30%, базовое, +30%, +60% от базового
     alpha_values = [
@@ -143,38 +169,10 @@ def analyze_alpha_impact(distances, parameters):
     ]
     alpha_values = sorted(list(set(alpha_values)))  # Убираем дубликаты и сортируем
     
-    iterations = list(range(int(parameters['n_iterations'])))
-    convergence_data = []
-    
-    for alpha in alpha_values:
-        aco = AntColonyTSP(
-            distances=distances,
-            n_ants=int(parameters['n_ants']),
-            n_iterations=int(parameters['n_iterations']),
-            decay=parameters['decay'],
-            alpha=alpha,
-            beta=parameters['beta'],
-            delay=0
-        )
-        
-        best_distances = []
-        current_best = float('inf')
-        
-        def iteration_callback(iteration, pheromone, paths, distances, current_best_info):
-            nonlocal current_best
-            if current_best_info[1] < current_best:
-                current_best = current_best_info[1]
-            best_distances.append(current_best)
-        
-        aco.on_iteration = iteration_callback
-        aco.solve()
-        
-        convergence_data.append(best_distances)
-    
-    return iterations, convergence_data, [f"Alpha: {a:.2f}" for a in alpha_values]
+    return [_configuration(parameters, f"Alpha: {a:.2f}", alpha=a) for a in alpha_values]
 
-def analyze_beta_impact(distances, parameters):
-    """Анализ влияния параметра beta на сходимость алгоритма"""
+def beta_impact_configurations(parameters):
+    """Наборы параметров для анализа влияния параметра beta"""
     base_beta = parameters['beta']
     # Создаем 5 значений: -60%, -30%, базовое, +30%, +60% от базового
     beta_values = [
@@ -186,117 +184,62 @@ def analyze_beta_impact(distances, parameters):
     ]
     beta_values = sorted(list(set(beta_values)))  # Убираем дубликаты и сортируем
     
-    iterations = list(range(int(parameters['n_iterations'])))
-    convergence_data = []
-    
-    for beta in beta_values:
-        aco = AntColonyTSP(
-            distances=distances,
-            n_ants=int(parameters['n_ants']),
-            n_iterations=int(parameters['n_iterations']),
-            decay=parameters['decay'],
-            alpha=parameters['alpha'],
-            beta=beta,
-            delay=0
-        )
-        
-        best_distances = []
-        current_best = float('inf')
-        
-        def iteration_callback(iteration, pheromone, paths, distances, current_best_info):
-            nonlocal current_best
-            if current_best_info[1] < current_best:
-                current_best = current_best_info[1]
-            best_distances.append(current_best)
-        
-        aco.on_iteration = iteration_callback
-        aco.solve()
-        
-        convergence_data.append(best_distances)
-    
-    return iterations, convergence_data, [f"Beta: {b:.2f}" for b in beta_values]
+    return [_configuration(parameters, f"Beta: {b:.2f}", beta=b) for b in beta_values]
 
-def analyze_parameters_comparison(distances, parameters):
-    """Анализ сходимости алгоритма с разными параметрами"""
-    # Определяем наборы параметров для сравнения
+def parameters_comparison_configurations(parameters):
+    """Наборы параметров для сравнения сходимости алгоритма"""
     base_ants = int(parameters['n_ants'])
     base_decay = parameters['decay']
     base_alpha = parameters['alpha']
     base_beta = parameters['beta']
     
+    def label(n_ants, decay, alpha, beta):
+        return f'Муравьи={n_ants}, Испарение={decay:.2f}, α={alpha:.2f}, β={beta:.2f}'
+    
     parameter_sets = [
-        {
-            'n_ants': base_ants,
-            'decay': base_decay,
-            'alpha': base_alpha,
-            'beta': base_beta,
-            'label': f'Муравьи={base_ants}, Испарение={base_decay:.2f}, α={base_alpha:.2f}, β={base_beta:.2f}'
-        },
-        {
-            'n_ants': max(5, int(base_ants * 0.4)),  # -60% муравьев
-            'decay': base_decay,
-            'alpha': base_alpha,
-            'beta': base_beta,
-            'label': f'Муравьи={max(5, int(base_ants * 0.4))}, Испарение={base_decay:.2f}, α={base_alpha:.2f}, β={base_beta:.2f}'
-        },
-        {
-            'n_ants': base_ants,
-            'decay': min(0.9, base_decay + 0.3),  # +0.3 к испарению
-            'alpha': base_alpha,
-            'beta': base_beta,
-            'label': f'Муравьи={base_ants}, Испарение={min(0.9, base_decay + 0.3):.2f}, α={base_alpha:.2f}, β={base_beta:.2f}'
-        },
-        {
-            'n_ants': base_ants,
-            'decay': max(0.1, base_decay - 0.3),  # -0.3 к испарению
-            'alpha': base_alpha,
-            'beta': base_beta,
-            'label': f'Муравьи={base_ants}, Испарение={max(0.1, base_decay - 0.3):.2f}, α={base_alpha:.2f}, β={base_beta:.2f}'
-        },
-        {
-            'n_ants': base_ants,
-            'decay': base_decay,
-            'alpha': base_alpha * 1.6,  # +60% к alpha
-            'beta': base_beta,
-            'label': f'Муравьи={base_ants}, Испарение={base_decay:.2f}, α={base_alpha * 1.6:.2f}, β={base_beta:.2f}'
-        },
-        {
-            'n_ants': base_ants,
-            'decay': base_decay,
-            'alpha': base_alpha,
-            'beta': base_beta * 1.6,  # +60% к beta
-            'label': f'Муравьи={base_ants}, Испарение={base_decay:.2f}, α={base_alpha:.2f}, β={base_beta * 1.6:.2f}'
-        }
+        (base_ants, base_decay, base_alpha, base_beta),
+        (max(5, int(base_ants * 0.4)), base_decay, base_alpha, base_beta),  # -60% муравьев
+        (base_ants, min(0.9, base_decay + 0.3), base_alpha, base_beta),     # +0.3 к испарению
+        (base_ants, max(0.1, base_decay - 0.3), base_alpha, base_beta),     # -0.3 к испарению
+        (base_ants, base_decay, base_alpha * 1.6, base_beta),               # +60% к alpha
+        (base_ants, base_decay, base_alpha, base_beta * 1.6)                # +60% к beta
     ]
     
-    iterations = list(range(int(parameters['n_iterations'])))
-    convergence_data = []
-    labels = []
-    
-    for params in parameter_sets:
-        aco = AntColonyTSP(
-            distances=distances,
-            n_ants=params['n_ants'],
-            n_iterations=int(parameters['n_iterations']),
-            decay=params['decay'],
-            alpha=params['alpha'],
-            beta=params['beta'],
-            delay=0
-        )
-        
-        best_distances = []
-        current_best = float('inf')
-        
-        def iteration_callback(iteration, pheromone, paths, distances, current_best_info):
-            nonlocal current_best
-            if current_best_info[1] < current_best:
-                current_best = current_best_info[1]
-            best_distances.append(current_best)
-        
-        aco.on_iteration = iteration_callback
-        aco.solve()
-        
-        convergence_data.append(best_distances)
-        labels.append(params['label'])
-    
-    return iterations, convergence_data, labels 
\ No newline at end of file
+    return [
+        _configuration(parameters, label(*values), n_ants=values[0], decay=values[1],
+                       alpha=values[2], beta=values[3])
+        for values in parameter_sets
+    ]
+
+def strategies_comparison_configurations(parameters):
+    """Наборы параметров для сравнения стратегий обновления феромонов"""
+    strategies = [
+        ('as', 'Ant System'),
+        ('mmas', 'MAX-MIN Ant System'),
+        ('acs', 'Ant Colony System')
+    ]
+    return [_configuration(parameters, label, strategy=strategy) for strategy, label in strategies]
+
+def analyze_ants_impact(distances, parameters, workers=None):
+    """Анализ влияния количества муравьев на сходимость алгоритма"""
+    return run_analysis(distances, parameters, ants_impact_configurations(parameters), workers)
+
+def analyze_decay_impact(distances, parameters, workers=None):
+    """Анализ влияния коэффициента испарения на сходимость алгоритма"""
+    return run_analysis(distances, parameters, decay_impact_configurations(parameters), workers)
+
+def analyze_alpha_impact(distances, parameters, workers=None):
+    """Анализ влияния параметра alpha на сходимость алгоритма"""
+    return run_analysis(distances, parameters, alpha_impact_configurations(parameters), workers)
+
+def analyze_beta_impact(distances, parameters, workers=None):
+    """Анализ влияния параметра beta на сходимость алгоритма"""
+    return run_analysis(distances, parameters, beta_impact_configurations(parameters), workers)
+
+def analyze_parameters_comparison(distances, parameters, workers=None):
+    """Анализ сходимости алгоритма с разными параметрами"""
+    return run_analysis(distances, parameters, parameters_comparison_configurations(parameters), workers)
+
+def analyze_strategies_comparison(distances, parameters, workers=None):
+    """Сравнение сходимости стратегий обновления феромонов"""
+    return run_analysis(distances, parameters, strategies_comparison_configurations(parameters), workers)
@@ -2,14 +2,38 @@ import sys
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QPushButton, 
                            QVBoxLayout, QHBoxLayout, QStackedWidget,
                            QProgressDialog, QApplication)
-from PyQt6.QtCore import Qt
-import matplotlib.pyplot as plt
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
-from analytics_utils import (analyze_ants_impact, analyze_decay_impact,
-                           analyze_alpha_impact, analyze_beta_impact,
-                           analyze_parameters_comparison)
+from analytics_utils import (ants_impact_configurations, decay_impact_configurations,
+                           alpha_impact_configurations, beta_impact_configurations,
+                           parameters_comparison_configurations, strategies_comparison_configurations,
+                           run_parameter_sweep)
+
+class SweepWorker(QObject):
+    """Перебор наборов параметров в отдельном потоке"""
+    # Номер набора параметров и его кривая сходимости
+    result_ready = pyqtSignal(int, object)
+    # Кривые сходимости всех наборов (None, если перебор завершился ошибкой)
+    finished = pyqtSignal(object)
+
+    def __init__(self, distances, configurations, n_iterations):
+        super().__init__()
+        self.distances = distances
+        self.configurations = configurations
+        self.n_iterations = n_iterations
+
+    def run(self):
+        convergence_data = None
+        try:
+            # Результаты передаются в GUI-поток сигналом, окно не ждет весь перебор
+            convergence_data = run_parameter_sweep(
+                self.distances, self.configurations, self.n_iterations,
+                on_result=self.result_ready.emit
+            )
+        finally:
+            self.finished.emit(convergence_data)
 
 class AnalyticsWindow(QMainWindow):
     def __init__(self, main_window):
@@ -32,45 +56,70 @@ class AnalyticsWindow(QMainWindow):
         # Остальной код инициализации будет выполнен после получения данных
         QApplication.processEvents()
         
-        # Получаем данные для всех графиков
+        # Запускаем сбор данных для всех графиков; интерфейс создается
+        # и окно показывается, когда перебор завершится
+        self.sweep_thread = None
+        self.sweep_worker = None
         self.collect_data()
-        
-        # Инициализируем интерфейс
-        self.init_ui()
 
     def collect_data(self):
-        """Сбор данных для всех графиков"""
-        # Данные для графика количества муравьев
-        self.progress_dialog.setLabelText("Анализ влияния количества муравьев (1/5)...")
+        """Запуск сбора данных для всех графиков в отдельном потоке"""
+        # Наборы параметров всех графиков запускаются одним параллельным перебором
+        self.analyses = [
+            ('ants_data', ants_impact_configurations(self.parameters)),
+            ('decay_data', decay_impact_configurations(self.parameters)),
+            ('alpha_data', alpha_impact_configurations(self.parameters)),
+            ('beta_data', beta_impact_configurations(self.parameters)),
+            ('comparison_data', parameters_comparison_configurations(self.parameters)),
+            ('strategies_data', strategies_comparison_configurations(self.parameters))
+        ]
+        self.n_configurations = sum(len(c) for _, c in self.analyses)
+        self.completed = 0
+        self.progress_dialog.setLabelText(f"Анализ параметров алгоритма (0/{self.n_configurations})...")
         self.progress_dialog.setValue(0)
-        QApplication.processEvents()
-        self.ants_data = analyze_ants_impact(self.distances, self.parameters)
-        
-        # Данные для графика коэффициента испарения
-        self.progress_dialog.setLabelText("Анализ влияния коэффициента испарения (2/5)...")
-        self.progress_dialog.setValue(20)
-        QApplication.processEvents()
-        self.decay_data = analyze_decay_impact(self.distances, self.parameters)
-        
-        # Данные для графика alpha
-        self.progress_dialog.setLabelText("Анализ влияния параметра alpha (3/5)...")
-        self.progress_dialog.setValue(40)
-        QApplication.processEvents()
-        self.alpha_data = analyze_alpha_impact(self.distances, self.parameters)
         
-        # Данные для графика beta
-        self.progress_dialog.setLabelText("Анализ влияния параметра beta (4/5)...")
-        self.progress_dialog.setValue(60)
-        QApplication.processEvents()
-        self.beta_data = analyze_beta_impact(self.distances, self.parameters)
-        
-        # Данные для графика сравнения параметров
-        self.progress_dialog.setLabelText("Анализ сравнения параметров (5/5)...")
-        self.progress_dialog.setValue(80)
-        QApplication.processEvents()
-        self.comparison_data = analyze_parameters_comparison(self.distances, self.parameters)
+        configurations = [c for _, analysis_configurations in self.analyses for c in analysis_configurations]
+        self.sweep_thread = QThread()
+        self.sweep_worker = SweepWorker(self.distances, configurations, int(self.parameters['n_iterations']))
+        self.sweep_worker.moveToThread(self.sweep_thread)
+        self.sweep_thread.started.connect(self.sweep_worker.run)
+        self.sweep_worker.result_ready.connect(self.on_sweep_result)
+        self.sweep_worker.finished.connect(self.on_sweep_finished)
+        self.sweep_worker.finished.connect(self.sweep_thread.quit)
+        self.sweep_thread.start()
+
+    def on_sweep_result(self, index, convergence):
+        """Обновление прогресса по мере завершения каждого запуска (в GUI-потоке)"""
+        self.completed += 1
+        self.progress_dialog.setLabelText(
+            f"Анализ параметров алгоритма ({self.completed}/{self.n_configurations})..."
+        )
+        self.progress_dialog.setValue(int(100 * self.completed / self.n_configurations))
+
+    def on_sweep_finished(self, convergence_data):
+        """Раскладка результатов по графикам и создание интерфейса (в GUI-потоке)"""
+        if convergence_data is None:
+            # Перебор завершился ошибкой - возвращаемся к главному окну
+            self.progress_dialog.close()
+            self.main_window.show()
+            return
+        
+        # Раскладываем результаты по графикам
+        n_iterations = int(self.parameters['n_iterations'])
+        iterations = list(range(n_iterations))
+        offset = 0
+        for attribute, analysis_configurations in self.analyses:
+            count = len(analysis_configurations)
+            setattr(self, attribute, (
+                iterations,
+                convergence_data[offset:offset + count],
+                [c['label'] for c in analysis_configurations]
+            ))
+            offset += count
         
         self.progress_dialog.setValue(100)
+        self.init_ui()
+        self.show()
 
     def init_ui(self):
         """Инициализация интерфейса после получения данных"""
@@ -130,7 +179,8 @@ class AnalyticsWindow(QMainWindow):
             'decay': QPushButton("Влияние коэффициента\nиспарения"),
             'alpha': QPushButton("Влияние параметра\nalpha"),
             'beta': QPushButton("Влияние параметра\nbeta"),
-            'comparison': QPushButton("Сравнение\nпараметров")
+            'comparison': QPushButton("Сравнение\nпараметров"),
+            'strategies': QPushButton("Сравнение\nстратегий")
         }
         
         # Настройка кнопок
@@ -153,6 +203,7 @@ class AnalyticsWindow(QMainWindow):
         self.buttons['alpha'].clicked.connect(lambda: self.show_plot(2))
         self.buttons['beta'].clicked.connect(lambda: self.show_plot(3))
         self.buttons['comparison'].clicked.connect(lambda: self.show_plot(4))
+        self.buttons['strategies'].clicked.connect(lambda: self.show_plot(5))
         
         # Добавление виджетов в горизонтальный layout
         content_layout.addWidget(button_panel, stretch=1)
@@ -186,6 +237,7 @@ class AnalyticsWindow(QMainWindow):
         self.create_alpha_plot()
         self.create_beta_plot()
         self.create_comparison_plot()
+        self.create_strategies_plot()
 
     def create_ants_plot(self):
         fig = Figure(facecolor='white')
@@ -352,6 +404,39 @@ class AnalyticsWindow(QMainWindow):
         
         self.plot_stack.addWidget(canvas)
 
+    def create_strategies_plot(self):
+        fig = Figure(facecolor='white')
+        canvas = FigureCanvas(fig)
+        ax = fig.add_subplot(111)
+        
+        # Настройка цветов для светлой темы
+        ax.set_facecolor('white')
+        fig.patch.set_facecolor('white')
+        ax.tick_params(colors='black')
+        ax.xaxis.label.set_color('black')
+        ax.yaxis.label.set_color('black')
+        ax.title.set_color('black')
+        
+        # Используем собранные данные
+        iterations, convergence_data, labels = self.strategies_data
+        
+        # Задаем цвета для линий
+        colors = ['#2980b9', '#e74c3c', '#27ae60']
+        
+        # Строим график для каждой стратегии
+        for i, (data, label) in enumerate(zip(convergence_data, labels)):
+            ax.plot(iterations, data, '-', label=label, color=colors[i % len(colors)], linewidth=2)
+        
+        ax.set_xlabel('Итерация')
+        ax.set_ylabel('Длина пути')
+        ax.set_title('Сравнение стратегий обновления феромонов')
+        ax.grid(True, color='#cccccc', linestyle='--', alpha=0.7)
+        
+        # Настраиваем легенду
+        ax.legend(loc='upper right', fontsize='medium')
+        
+        self.plot_stack.addWidget(canvas)
+
     def show_plot(self, index):
         # Снимаем выделение со всех кнопок
         for button in self.buttons.values():
@@ -1,7 +1,201 @@
 import numpy as np
-from typing import List, Tuple, Callable
-import random
+from typing import List, Tuple, Callable, NamedTuple
 import time
+import warnings
+from contextlib import nullcontext
+from checkpoint import CheckpointWriter, load_checkpoint
+from candidate_matrix import CandidateMatrix
+from coordinates import CoordinateDistances
+from local_search import LOCAL_SEARCH_METHODS
+from packed_matrix import PackedSymmetricMatrix, storage_values
+from profiling import SolverProfile
+from warm_start import remap_pheromone, remap_tour
+
+# Контекст фазы при выключенном профилировании
+_NO_PROFILE = nullcontext()
+
+class Tour(NamedTuple):
+    """Маршрут муравья и его длина, вычисленная один раз по этому же маршруту"""
+    path: List[int]
+    length: float
+
+class IterationState:
+    """
+    Легкая запись об итерации, которую выдает AntColonyTSP.iterate().
+    Лучший маршрут и длины доступны сразу; списки маршрутов собираются,
+    а матрица феромонов копируется только при обращении. Запись отражает
+    состояние решателя до перехода к следующей итерации
+    """
+    __slots__ = ('iteration', 'best_path', 'best_distance', 'improved', 'elapsed', '_solver', '_tours')
+
+    def __init__(self, solver, iteration: int, tours: List[Tour], improved: bool, elapsed: float):
+        self.iteration = iteration
+        self.best_path = solver.best_path
+        self.best_distance = solver.best_distance
+        self.improved = improved
+        self.elapsed = elapsed
+        self._solver = solver
+        self._tours = tours
+
+    @property
+    def iteration_best(self) -> Tour:
+        """Лучший маршрут итерации"""
+        return min(self._tours, key=lambda tour: tour.length)
+
+    @property
+    def paths(self) -> List[List[int]]:
+        """Маршруты всех муравьев итерации"""
+        return [tour.path for tour in self._tours]
+
+    @property
+    def distances(self) -> List[float]:
+        """Длины маршрутов итерации"""
+        return [tour.length for tour in self._tours]
+
+    def pheromone(self, copy: bool = True):
+        """Матрица феромонов после обновления (copy=False - без копирования, только для чтения)"""
+        return self._solver.pheromone.copy() if copy else self._solver.pheromone
+
+def ant_random_numbers(seeds, n_cities: int, exploitation: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Случайные числа для построения маршрутов группой муравьев
+
+    Args:
+        seeds: зерна генераторов муравьев (числа или np.random.SeedSequence)
+        n_cities: количество городов
+        exploitation: нужны ли числа для жадного выбора (правило q0 в ACS)
+
+    Returns:
+        стартовые города формы (n_ants,), равномерные числа для выбора города
+        формы (n_ants, n_cities) и числа для правила q0 той же формы (или None)
+    """
+    starts = np.empty(len(seeds), dtype=np.intp)
+    uniforms = np.empty((len(seeds), n_cities))
+    exploit = np.empty((len(seeds), n_cities)) if exploitation else None
+    for ant, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        starts[ant] = rng.integers(n_cities)
+        uniforms[ant] = rng.random(n_cities)
+        if exploitation:
+            exploit[ant] = rng.random(n_cities)
+    return starts, uniforms, exploit
+
+def build_tours(
+    choice_info: np.ndarray,
+    candidates: np.ndarray,
+    starts: np.ndarray,
+    uniforms: np.ndarray,
+    exploit: np.ndarray = None,
+    q0: float = 0.0,
+    on_step: Callable = None
+) -> np.ndarray:
+    """
+    Построение маршрутов для группы муравьев, идущих шаг в шаг
+
+    Args:
+        choice_info: привлекательность переходов tau^alpha * eta^beta
+        candidates: списки кандидатов формы (n_cities, k) или None
+        starts: стартовые города муравьев, форма (n_ants,)
+        uniforms: равномерные случайные числа из [0, 1), форма (n_ants, n_cities);
+            на шаге step муравей использует число uniforms[:, step]
+        exploit: равномерные числа для правила q0: если exploit[:, step] < q0,
+            муравей жадно выбирает самый привлекательный переход (None - не используется)
+        q0: вероятность жадного выбора
+        on_step: функция on_step(from_cities, to_cities), вызываемая после каждого шага
+            (например, для локального обновления феромона в ACS)
+
+    Returns:
+        матрица маршрутов формы (n_ants, n_cities)
+    """
+    n_ants = len(starts)
+    n_cities = len(choice_info)
+    ants = np.arange(n_ants)
+    paths = np.empty((n_ants, n_cities), dtype=np.intp)
+    visited = np.zeros((n_ants, n_cities), dtype=bool)
+
+    current = np.asarray(starts, dtype=np.intp)
+    paths[:, 0] = current
+    visited[ants, current] = True
+
+    for step in range(1, n_cities):
+        u = uniforms[:, step]
+        greedy = exploit[:, step] < q0 if exploit is not None else None
+
+        if candidates is None:
+            next_city = _sample_full_scan(choice_info, current, visited, u, greedy)
+        else:
+            # Выбор среди непосещенных кандидатов текущего города
+            current_candidates = candidates[current]
+            if isinstance(choice_info, CandidateMatrix) and choice_info.candidates is candidates:
+                # Привлекательность кандидатов хранится таблицей, выровненной со списками
+                weights = choice_info.table[current]
+            else:
+                weights = choice_info[current[:, None], current_candidates]
+            weights[visited[ants[:, None], current_candidates]] = 0.0
+            cumulative = np.cumsum(weights, axis=1)
+            has_candidates = cumulative[:, -1] > 0
+
+            next_city = np.empty_like(current)
+            if has_candidates.any():
+                chosen = _sample_cumulative(
+                    cumulative[has_candidates], u[has_candidates],
+                    weights[has_candidates], greedy[has_candidates] if greedy is not None else None
+                )
+                next_city[has_candidates] = current_candidates[has_candidates, chosen]
+
+            # Муравьи с исчерпанными кандидатами просматривают все города
+            exhausted = ~has_candidates
+            if exhausted.any():
+                next_city[exhausted] = _sample_full_scan(
+                    choice_info, current[exhausted], visited[exhausted], u[exhausted],
+                    greedy[exhausted] if greedy is not None else None
+                )
+
+        if on_step is not None:
+            on_step(current, next_city)
+        current = next_city
+        paths[:, step] = current
+        visited[ants, current] = True
+
+    return paths
+
+def _sample_full_scan(
+    choice_info: np.ndarray,
+    current: np.ndarray,
+    visited: np.ndarray,
+    u: np.ndarray,
+    greedy: np.ndarray = None
+) -> np.ndarray:
+    """Выбор следующего города среди всех непосещенных для группы муравьев"""
+    weights = choice_info[current]
+    weights[visited] = 0.0
+    cumulative = np.cumsum(weights, axis=1)
+
+    # Если у муравья все веса равны 0, выбираем равновероятно среди непосещенных
+    stalled = cumulative[:, -1] <= 0
+    if stalled.any():
+        weights[stalled] = ~visited[stalled]
+        cumulative[stalled] = np.cumsum(~visited[stalled], axis=1)
+
+    return _sample_cumulative(cumulative, u, weights, greedy)
+
+def _sample_cumulative(
+    cumulative: np.ndarray,
+    u: np.ndarray,
+    weights: np.ndarray = None,
+    greedy: np.ndarray = None
+) -> np.ndarray:
+    """
+    Выбор индекса в каждой строке по накопленным суммам весов;
+    строки с greedy = True получают индекс наибольшего веса
+    """
+    totals = cumulative[:, -1]
+    # Порог строго меньше суммы, чтобы не выбрать город с нулевым весом
+    thresholds = np.minimum(u * totals, np.nextafter(totals, 0))
+    chosen = np.argmax(cumulative > thresholds[:, None], axis=1)
+    if greedy is not None and greedy.any():
+        chosen[greedy] = np.argmax(weights[greedy], axis=1)
+    return chosen
 
 class AntColonyTSP:
     def __init__(
@@ -13,7 +207,33 @@ class AntColonyTSP:
         alpha: float = 1.0,
         beta: float = 2.0,
         on_iteration: Callable = None,
-        delay: float = 0.1  # Задержка между итерациями в секундах
+        construction: str = 'vectorized',
+        candidate_list_size: int = None,
+        backend: str = 'numpy',
+        local_search=None,
+        local_search_scope: str = 'all',
+        local_search_neighbors: int = 10,
+        strategy: str = 'as',
+        p_best: float = 0.05,
+        q0: float = 0.9,
+        local_decay: float = 0.1,
+        stagnation_iterations: int = None,
+        min_branching_factor: float = None,
+        branching_lambda: float = 0.05,
+        target_distance: float = None,
+        time_limit: float = None,
+        dtype='float64',
+        storage: str = 'dense',
+        seed=None,
+        profile: bool = False,
+        profile_hook: Callable = None,
+        checkpoint_path: str = None,
+        checkpoint_every: int = 10,
+        resume_from: str = None,
+        initial_pheromone=None,
+        seed_tour=None,
+        city_map=None,
+        warm_start_iterations: int = 5
     ):
         """
         Инициализация алгоритма муравьиной колонии для решения задачи коммивояжера
@@ -26,9 +246,146 @@ class AntColonyTSP:
             alpha: важность феромона
             beta: важность расстояния
             on_iteration: функция обратного вызова для визуализации процесса
-            delay: задержка между итерациями в секундах
+            construction: способ построения маршрутов:
+                'vectorized' - все муравьи строят маршруты одновременно (пакетно)
+                'sequential' - муравьи строят маршруты по одному
+            candidate_list_size: размер списка кандидатов (k ближайших соседей);
+                если задан, муравей выбирает следующий город среди непосещенных
+                кандидатов и просматривает все города, только когда кандидаты исчерпаны
+            backend: реализация внутренних циклов пакетного режима:
+                'numpy' - векторные операции NumPy
+                'numba' - скомпилированные ядра Numba (если Numba не установлена,
+                используется NumPy); при одинаковом зерне маршруты совпадают с 'numpy'
+            local_search: локальный поиск после построения маршрутов: None, '2-opt',
+                'or-opt', '2-opt+or-opt' или функция f(path, distances, neighbors) -> path
+            local_search_scope: к каким маршрутам применяется локальный поиск:
+                'all' - ко всем маршрутам итерации
+                'iteration_best' - только к лучшему маршруту итерации
+                'global_best' - только к маршруту, который становится новым лучшим
+            local_search_neighbors: размер списков соседей для локального поиска
+                (если заданы списки кандидатов, используются они)
+            strategy: правило обновления феромонов:
+                'as' - Ant System: феромон откладывают все муравьи
+                'mmas' - MAX-MIN Ant System: феромон откладывает только лучший муравей
+                итерации, значения ограничены границами [tau_min, tau_max]
+                'acs' - Ant Colony System: псевдослучайное пропорциональное правило
+                выбора (q0), локальное обновление на каждом шаге и глобальное
+                обновление по лучшему найденному маршруту
+            p_best: вероятность построить лучший маршрут при сходимости MMAS
+                (задает отношение tau_min / tau_max)
+            q0: вероятность жадного выбора следующего города в ACS
+            local_decay: коэффициент локального испарения феромона в ACS
+            stagnation_iterations: остановка, если лучший маршрут не улучшался
+                столько итераций подряд (None - не проверяется)
+            min_branching_factor: остановка, когда средний лямбда-коэффициент
+                ветвления матрицы феромонов опускается до этого значения
+                (2.0 - почти у каждого города осталось по два "сильных" ребра);
+                не поддерживается для стратегии 'acs'
+            branching_lambda: параметр лямбда для коэффициента ветвления
+            target_distance: остановка при нахождении маршрута не длиннее заданного
+            time_limit: ограничение времени решения в секундах
+            dtype: тип чисел матриц феромонов, эвристики и расстояний: 'float64'
+                или 'float32' (вдвое меньше памяти; длины маршрутов суммируются в float64)
+            storage: хранение матриц:
+                'dense' - полные матрицы n x n
+                'packed' - только верхний треугольник симметричной матрицы
+                (вдвое меньше памяти; матрица расстояний должна быть симметричной,
+                поддерживается только реализация 'numpy')
+                'candidates' - феромоны, эвристика и привлекательность хранятся только
+                для ребер списков кандидатов (n x k, см. CandidateMatrix), у остальных
+                ребер общий уровень феромона, а эвристика вычисляется по расстояниям
+                при обращении; вместе с задачей по координатам решатель не хранит
+                ничего размером n x n. Нужен candidate_list_size, поддерживается
+                только реализация 'numpy'
+            seed: зерно генератора случайных чисел (int или np.random.SeedSequence);
+                у каждого муравья каждой итерации свой поток, порожденный из зерна,
+                поэтому при одинаковом зерне последовательный, пакетный и
+                параллельный режимы строят одинаковые маршруты (кроме
+                последовательного режима ACS). None - зерно берется из энтропии ОС
+            profile: собирать время фаз итерации и счетчики в self.profile
+                (SolverProfile); без профилирования self.profile равен None
+            profile_hook: функция f(record), получающая профиль каждой итерации
+                (например, JsonLinesProfileLog); включает профилирование
+            checkpoint_path: файл .npz для контрольных точек (None - без них);
+                точки записываются в фоновом потоке каждые checkpoint_every
+                итераций, при остановке и по завершении решения
+            checkpoint_every: период записи контрольных точек в итерациях
+            resume_from: контрольная точка, с которой продолжается решение;
+                параметры решателя должны совпадать с сохраненными (кроме
+                числа итераций и критериев остановки), тогда продолжение дает
+                тот же результат, что и решение без перерыва; time_limit
+                отсчитывается от начала продолжения
+            initial_pheromone: матрица феромонов предыдущего решения (плотная или
+                PackedSymmetricMatrix, см. также warm_start.checkpoint_pheromone)
+                вместо равномерного начального уровня
+            seed_tour: начальный маршрут: 'nearest_neighbor' (жадный маршрут) или
+                список городов (например, лучший маршрут прошлого решения);
+                феромоны обновляются по нему warm_start_iterations раз, как если бы
+                его нашли все муравьи, и он становится начальным лучшим маршрутом
+            city_map: соответствие городов для initial_pheromone и seed_tour из
+                измененной задачи: city_map[i] - номер города i в старой задаче
+                или -1 для нового города (см. warm_start)
+            warm_start_iterations: число обновлений феромонов по seed_tour
         """
-        self.distances = np.array(distances)
+        if construction not in ('vectorized', 'sequential'):
+            raise ValueError(f"Неизвестный способ построения маршрутов: {construction}")
+        if backend not in ('numpy', 'numba'):
+            raise ValueError(f"Неизвестная реализация: {backend}")
+        if isinstance(local_search, str) and local_search not in LOCAL_SEARCH_METHODS:
+            raise ValueError(f"Неизвестный локальный поиск: {local_search}")
+        if local_search_scope not in ('all', 'iteration_best', 'global_best'):
+            raise ValueError(f"Неизвестная область локального поиска: {local_search_scope}")
+        if strategy not in ('as', 'mmas', 'acs'):
+            raise ValueError(f"Неизвестная стратегия обновления феромонов: {strategy}")
+        if not 0 < p_best < 1:
+            raise ValueError("p_best должен быть в интервале (0, 1)")
+        if not 0 <= q0 <= 1:
+            raise ValueError("q0 должен быть в интервале [0, 1]")
+        if not 0 <= local_decay <= 1:
+            raise ValueError("local_decay должен быть в интервале [0, 1]")
+        if stagnation_iterations is not None and stagnation_iterations < 1:
+            raise ValueError("stagnation_iterations должен быть положительным")
+        if min_branching_factor is not None and strategy == 'acs':
+            # В ACS феромон выше tau0 только на ребрах лучшего маршрута,
+            # поэтому коэффициент ветвления равен 2 с первой итерации
+            raise ValueError("Остановка по коэффициенту ветвления не поддерживается для стратегии ACS")
+        if not 0 < branching_lambda < 1:
+            raise ValueError("branching_lambda должен быть в интервале (0, 1)")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("time_limit должен быть положительным")
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(f"Неподдерживаемый тип чисел: {dtype}")
+        if storage not in ('dense', 'packed', 'candidates'):
+            raise ValueError(f"Неизвестный способ хранения матриц: {storage}")
+        if storage == 'candidates' and not candidate_list_size:
+            raise ValueError("Хранение 'candidates' требует списков кандидатов (candidate_list_size)")
+        if storage != 'dense' and backend == 'numba':
+            raise ValueError("Реализация Numba поддерживает только плотное хранение матриц")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every должен быть положительным")
+        if isinstance(seed_tour, str) and seed_tour != 'nearest_neighbor':
+            raise ValueError(f"Неизвестный начальный маршрут: {seed_tour}")
+        if city_map is not None and len(city_map) != len(distances):
+            raise ValueError("Длина city_map должна совпадать с числом городов")
+        if warm_start_iterations < 0:
+            raise ValueError("warm_start_iterations не может быть отрицательным")
+
+        self.dtype = np.dtype(dtype)
+        self.storage = storage
+
+        # Массив NumPy (в том числе отображенный в память) используется без копирования;
+        # задача по координатам хранит только координаты
+        if isinstance(distances, (CoordinateDistances, PackedSymmetricMatrix)):
+            self.distances = distances
+        elif storage == 'packed':
+            self.distances = PackedSymmetricMatrix.from_rows(distances, self.dtype)
+        else:
+            self.distances = np.asarray(distances, dtype=self.dtype)
+        # Переданная матрица копируется перед первым изменением (update_distances)
+        self._owns_distances = not (
+            self.distances is distances
+            or isinstance(distances, np.ndarray) and np.may_share_memory(self.distances, distances)
+        )
         self.n_cities = len(distances)
         self.n_ants = n_ants
         self.n_iterations = n_iterations
@@ -36,129 +393,903 @@ class AntColonyTSP:
         self.alpha = alpha
         self.beta = beta
         self.on_iteration = on_iteration
-        self.delay = delay
-        
+        self.construction = construction
+
+        # Потоки случайных чисел муравьев порождаются из одного зерна;
+        # self.seed позволяет повторить запуск, начатый с seed=None
+        self._seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.seed = self._seed_sequence.entropy
+        self._seed_round = 0
+
+        # Профилирование фаз итерации
+        self.profile = SolverProfile(profile_hook) if profile or profile_hook else None
+
+        # Скомпилированные ядра загружаются только по запросу
+        self.backend = backend
+        self._kernels = None
+        if backend == 'numba':
+            try:
+                import aco_kernels
+                self._kernels = aco_kernels
+            except ImportError:
+                warnings.warn("Numba не установлена, используется реализация на NumPy")
+                self.backend = 'numpy'
+
+        # Параметры стратегии обновления феромонов
+        self.strategy = strategy
+        self.p_best = p_best
+        self.q0 = q0
+        self.local_decay = local_decay
+
+        # Критерии досрочной остановки
+        self.stagnation_iterations = stagnation_iterations
+        self.min_branching_factor = min_branching_factor
+        self.branching_lambda = branching_lambda
+        self.target_distance = target_distance
+        self.time_limit = time_limit
+
+        # Списки кандидатов: k ближайших соседей каждого города по возрастанию расстояния
+        self.candidate_list_size = candidate_list_size
+        self.candidates = None
+        if candidate_list_size:
+            self.candidates = self._build_candidate_lists(candidate_list_size)
+
         # Инициализация матрицы феромонов
-        self.pheromone = np.ones((self.n_cities, self.n_cities))
+        self.pheromone = self._new_matrix()
+        self.pheromone.fill(1.0)
         self.best_path = None
         self.best_distance = float('inf')
+        # Лучший маршрут, с которого начинается каждое решение (задается seed_tour)
+        self._initial_best = (None, float('inf'))
+        self.start_time = None
+        self.stop_reason = None
 
-    def _calculate_probabilities(self, pheromone: np.ndarray, dist: np.ndarray, visited: List[int], current: int) -> np.ndarray:
-        """Вычисление вероятностей перехода в следующий город"""
-        pheromone = np.copy(pheromone[current])
-        dist = np.copy(dist[current])
-        
-        # Установка вероятности 0 для посещенных городов
-        for i in visited:
-            pheromone[i] = 0
-            
-        # Вычисление вероятностей
-        probabilities = (pheromone ** self.alpha) * ((1.0 / (dist + 1e-10)) ** self.beta)
-        
-        # Проверка на случай, если все вероятности равны 0
-        sum_probabilities = np.sum(probabilities)
-        if sum_probabilities == 0:
-            # Если все вероятности равны 0, установим равные вероятности для непосещенных городов
-            unvisited = [i for i in range(self.n_cities) if i not in visited]
-            if unvisited:
-                probabilities[unvisited] = 1
-            
-        # Нормализация вероятностей
-        sum_probabilities = np.sum(probabilities)
-        if sum_probabilities > 0:
-            probabilities = probabilities / sum_probabilities
-        
-        return probabilities
-
-    def _construct_solution(self) -> Tuple[List[int], float]:
-        """Построение решения одним муравьем"""
-        path = []
-        visited = set()
-        current_city = random.randint(0, self.n_cities - 1)
-        path.append(current_city)
-        visited.add(current_city)
-        
-        while len(visited) < self.n_cities:
-            probabilities = self._calculate_probabilities(
-                self.pheromone,
-                self.distances,
-                list(visited),
-                current_city
-            )
-            
-            # Выбор следующего города
-            next_city = np.random.choice(range(self.n_cities), p=probabilities)
+        # Контрольные точки; _resume - (номер следующей итерации, счетчик застоя)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._resume = None
+
+        # MMAS и ACS начинают с уровня, согласованного с длиной жадного маршрута
+        self.tau_min = 0.0
+        self.tau_max = np.inf
+        self.tau0 = 1.0
+        if strategy != 'as':
+            nearest_length = self._nearest_neighbor_length()
+            if strategy == 'mmas':
+                self._update_trail_limits(nearest_length)
+                self.pheromone.fill(self.tau_max)
+            else:
+                self.tau0 = 1.0 / (self.n_cities * nearest_length)
+                self.pheromone.fill(self.tau0)
+
+        # Эвристика eta^beta не меняется во время решения, вычисляем ее один раз
+        if storage == 'candidates':
+            self.heuristic = self._candidate_heuristic()
+        elif isinstance(self.distances, CoordinateDistances):
+            # Для задачи по координатам эвристика не хранится и вычисляется блоками строк
+            self.heuristic = None
+        elif storage == 'packed':
+            self.heuristic = PackedSymmetricMatrix.from_rows(self.distances, self.dtype, transform=self._eta)
+        else:
+            # Эвристика диагонали может не поместиться в float32; она не используется
+            with np.errstate(over='ignore'):
+                self.heuristic = self._eta(self.distances).astype(self.dtype, copy=False)
+        # Привлекательность переходов tau^alpha * eta^beta, пересчитывается
+        # только при обновлении феромонов
+        self.choice_info = None
+        self._update_choice_info()
+
+        # Локальный поиск и списки соседей для него
+        self.local_search = LOCAL_SEARCH_METHODS.get(local_search, local_search)
+        self.local_search_scope = local_search_scope
+        self.local_search_neighbors = None
+        if self.local_search is not None:
+            self.local_search_neighbors = self.candidates
+            if self.local_search_neighbors is None:
+                self.local_search_neighbors = self._build_candidate_lists(local_search_neighbors)
+
+        # Теплый старт по результатам предыдущего решения
+        if initial_pheromone is not None:
+            self._set_initial_pheromone(initial_pheromone, city_map)
+        if seed_tour is not None:
+            self._apply_seed_tour(seed_tour, city_map, warm_start_iterations)
+
+        if resume_from is not None:
+            self._restore_checkpoint(load_checkpoint(resume_from))
+
+    def _build_candidate_lists(self, size: int, block_size: int = 256) -> np.ndarray:
+        """Построение списков k ближайших соседей (блоками строк для экономии памяти)"""
+        k = max(1, min(size, self.n_cities - 1))
+        candidates = np.empty((self.n_cities, k), dtype=np.intp)
+        self._fill_neighbor_rows(candidates, np.arange(self.n_cities), block_size)
+        return candidates
+
+    def _fill_neighbor_rows(self, lists: np.ndarray, cities: np.ndarray, block_size: int = 256):
+        """Пересчет строк cities списков соседей lists (k ближайших по возрастанию расстояния)"""
+        k = lists.shape[1]
+        for start in range(0, len(cities), block_size):
+            block = cities[start:start + block_size]
+            rows = np.array(self.distances[block], dtype=float)
+            # Город не может быть кандидатом сам для себя
+            rows[np.arange(len(block)), block] = np.inf
+            nearest = np.argpartition(rows, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(rows, nearest, axis=1), axis=1, kind='stable')
+            lists[block] = np.take_along_axis(nearest, order, axis=1)
+
+    def _nearest_neighbor_tour(self) -> Tour:
+        """Маршрут, построенный жадно (ближайший сосед) из города 0"""
+        visited = np.zeros(self.n_cities, dtype=bool)
+        current = 0
+        visited[current] = True
+        path = [current]
+        length = 0.0
+        for _ in range(self.n_cities - 1):
+            next_city = self._nearest_candidate(current, visited)
+            if next_city is not None:
+                length += self.distances[current, next_city]
+            else:
+                # Одна строка срезом: задача по координатам не вычисляет блок строк для кэша,
+                # который при переходах между далекими городами не пригодится
+                row = np.where(visited, np.inf, self.distances[current:current + 1][0])
+                next_city = int(np.argmin(row))
+                length += row[next_city]
+            visited[next_city] = True
             path.append(next_city)
-            visited.add(next_city)
-            current_city = next_city
-            
-        # Вычисление общего расстояния
-        total_distance = 0
-        for i in range(len(path)):
-            total_distance += self.distances[path[i]][path[(i + 1) % self.n_cities]]
-            
-        return path, total_distance
+            current = next_city
+        return Tour(path, float(length + self.distances[current, 0]))
+
+    def _nearest_candidate(self, city: int, visited: np.ndarray):
+        """
+        Ближайший непосещенный город из списка кандидатов city или None, если
+        выбор может отличаться от просмотра всей строки расстояний
+        """
+        if self.candidates is None:
+            return None
+        options = self.candidates[city]
+        option_distances = np.asarray(self.distances[city, options], dtype=float)
+        free = ~visited[options]
+        if not free.any():
+            return None
+        nearest = option_distances[free].min()
+        # Города ближе последнего кандидата все есть в списке, поэтому при равных
+        # расстояниях выбирается тот же город с меньшим номером, что и в полной строке
+        if nearest >= option_distances[-1]:
+            return None
+        return int(options[free & (option_distances == nearest)].min())
+
+    def _nearest_neighbor_length(self) -> float:
+        """Длина маршрута, построенного жадно (ближайший сосед) из города 0"""
+        return self._nearest_neighbor_tour().length
+
+    def _initial_pheromone_level(self) -> float:
+        """Начальный уровень феромона стратегии (для новых ребер)"""
+        return {'as': 1.0, 'mmas': self.tau_max, 'acs': self.tau0}[self.strategy]
+
+    def _set_initial_pheromone(self, pheromone, city_map=None):
+        """Начальные феромоны из предыдущего решения (с переносом нумерации городов)"""
+        if city_map is None and np.shape(pheromone) != (self.n_cities, self.n_cities):
+            raise ValueError(f"Размер начальной матрицы феромонов {np.shape(pheromone)} не совпадает с числом городов")
+
+        if self.storage == 'candidates':
+            # Переносятся только феромоны ребер списков кандидатов, полная матрица не строится
+            self.pheromone = self._candidate_pheromone(pheromone, city_map)
+        else:
+            if city_map is not None:
+                # Ребра новых городов получают начальный уровень стратегии
+                pheromone = remap_pheromone(pheromone, city_map, self._initial_pheromone_level())
+            if self.storage == 'packed':
+                self.pheromone = PackedSymmetricMatrix.from_rows(pheromone, self.dtype)
+            else:
+                self.pheromone[...] = pheromone
+        if self.strategy == 'mmas':
+            values = storage_values(self.pheromone)
+            np.clip(values, self.tau_min, self.tau_max, out=values)
+        self._update_choice_info()
+
+    def _apply_seed_tour(self, seed_tour, city_map=None, iterations: int = 5):
+        """Обновление феромонов по начальному маршруту, который становится лучшим"""
+        if isinstance(seed_tour, str):
+            path = self._nearest_neighbor_tour().path
+        elif city_map is not None:
+            path = remap_tour(seed_tour, city_map, self.distances)
+        else:
+            path = [int(city) for city in seed_tour]
+        if sorted(path) != list(range(self.n_cities)):
+            raise ValueError("Начальный маршрут должен проходить все города по одному разу")
+
+        tour = self._evaluate_tours([path])[0]
+        self.best_path, self.best_distance = tour.path, tour.length
+        self._initial_best = (tour.path, tour.length)
+        # Колония как будто несколько итераций подряд находила этот маршрут
+        for _ in range(iterations):
+            self._update_pheromone([tour.path] * self.n_ants, [tour.length] * self.n_ants)
+
+    def _update_trail_limits(self, best_distance: float):
+        """Пересчет границ феромона MMAS по длине лучшего маршрута"""
+        self.tau_max = 1.0 / (self.decay * best_distance)
+        p_dec = self.p_best ** (1.0 / self.n_cities)
+        self.tau_min = self.tau_max * (1 - p_dec) / (max(self.n_cities / 2 - 1, 1) * p_dec)
+        self.tau_min = min(self.tau_min, self.tau_max)
+
+    @classmethod
+    def from_coordinates(cls, coordinates, metric='euclidean', **kwargs):
+        """
+        Решатель для задачи, заданной координатами городов (см. CoordinateDistances);
+        матрица расстояний не строится
+        """
+        return cls(CoordinateDistances(coordinates, metric), **kwargs)
+
+    def _new_matrix(self):
+        """Новая (неинициализированная) матрица n x n в выбранном способе хранения"""
+        if self.storage == 'packed':
+            return PackedSymmetricMatrix.empty(self.n_cities, self.dtype)
+        if self.storage == 'candidates':
+            return CandidateMatrix.empty(self.candidates, self.dtype)
+        return np.empty((self.n_cities, self.n_cities), dtype=self.dtype)
+
+    def _candidate_heuristic(self) -> CandidateMatrix:
+        """Эвристика хранения 'candidates': значения ребер списков, остальные вычисляются по расстояниям"""
+        # Эвристика совпадающих городов может не поместиться в float32
+        with np.errstate(over='ignore'):
+            table = self._eta_pairs(np.arange(self.n_cities)[:, None], self.candidates)
+            values = np.append(table.ravel(), 1.0).astype(self.dtype, copy=False)
+        return CandidateMatrix(self.candidates, values, background=self._eta_pairs)
+
+    def _candidate_pheromone(self, pheromone, city_map=None) -> CandidateMatrix:
+        """
+        Феромоны ребер текущих списков кандидатов из матрицы pheromone любого
+        способа хранения; city_map - номера городов в нумерации pheromone (-1 -
+        новый город, его ребра получают уровень ребер вне списков)
+        """
+        if not isinstance(pheromone, (np.ndarray, PackedSymmetricMatrix, CandidateMatrix)):
+            pheromone = np.asarray(pheromone, dtype=float)
+        rows, columns = np.broadcast_arrays(np.arange(self.n_cities)[:, None], self.candidates)
+        if city_map is not None:
+            city_map = np.asarray(city_map, dtype=np.intp)
+            rows, columns = city_map[rows], city_map[columns]
+        level = pheromone.level if isinstance(pheromone, CandidateMatrix) else self._initial_pheromone_level()
+        result = CandidateMatrix.full(self.candidates, level, self.dtype)
+        known = (rows >= 0) & (columns >= 0)
+        result.table[known] = pheromone[rows[known], columns[known]]
+        return result
+
+    def _set_candidate_storage(self, pheromone, city_map=None):
+        """Матрицы хранения 'candidates' по изменившимся спискам кандидатов; феромоны переносятся из pheromone"""
+        self.pheromone = self._candidate_pheromone(pheromone, city_map)
+        self.heuristic = self._candidate_heuristic()
+        self._update_choice_info()
+
+    def update_distances(self, rows, columns, values):
+        """
+        Изменение расстояний между городами rows[i] и columns[i] (например, из-за
+        пробок) без перезапуска: матрица остается симметричной, феромоны
+        сохраняются, эвристика и привлекательность пересчитываются только для
+        измененных пар, списки кандидатов - только для их городов. Вызывается
+        между решениями; следующее решение начинается с пересчитанного лучшего маршрута
+        """
+        if isinstance(self.distances, CoordinateDistances):
+            raise ValueError("Расстояния задачи по координатам изменяются через координаты городов")
+        rows, columns, values = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(rows, dtype=np.intp)),
+            np.atleast_1d(np.asarray(columns, dtype=np.intp)),
+            np.atleast_1d(np.asarray(values, dtype=float))
+        )
+        if not self._owns_distances:
+            # Матрица вызывающего кода не меняется
+            self.distances = self.distances.copy()
+            self._owns_distances = True
+        # Списки кандидатов меняются на месте, поэтому феромоны по ним копируются вместе со списками
+        previous = self.pheromone.copy() if self.storage == 'candidates' else None
+        self._set_symmetric(self.distances, rows, columns, values)
+        cities = np.union1d(rows, columns)
+        for lists in self._neighbor_lists():
+            self._fill_neighbor_rows(lists, cities)
+        if previous is not None:
+            self._set_candidate_storage(previous)
+        else:
+            self._refresh_pairs(rows, columns)
+        self._reset_best(self.best_path)
+
+    def add_cities(self, distances=None, coordinates=None) -> np.ndarray:
+        """
+        Добавление городов в конец нумерации без перезапуска: феромоны,
+        эвристика и привлекательность существующих ребер сохраняются, новые
+        ребра получают начальный уровень феромона; списки кандидатов
+        пересчитываются для новых городов и тех, к кому новый город ближе
+        самого дальнего кандидата. Новые города вставляются в лучший маршрут
+        туда, где он удлиняется меньше всего
+
+        Args:
+            distances: для задачи с матрицей расстояний - расстояния от новых
+                городов до всех городов (включая новые), форма (m, n + m)
+            coordinates: для задачи по координатам - координаты новых городов (m, 2)
+
+        Returns:
+            номера новых городов
+        """
+        n = self.n_cities
+        if isinstance(self.distances, CoordinateDistances):
+            if coordinates is None:
+                raise ValueError("Для задачи по координатам нужны координаты новых городов")
+            coordinates = np.atleast_2d(np.asarray(coordinates, dtype=float))
+            m = len(coordinates)
+        else:
+            if distances is None:
+                raise ValueError("Нужны расстояния от новых городов до всех городов")
+            distances = np.atleast_2d(np.asarray(distances, dtype=float))
+            m = len(distances)
+            if distances.shape != (m, n + m):
+                raise ValueError(f"Расстояния новых городов должны иметь форму ({m}, {n + m}), получено {distances.shape}")
+        self._remap_cities(np.concatenate([np.arange(n), np.full(m, -1)]), distances, coordinates)
+        return np.arange(n, n + m)
+
+    def remove_cities(self, cities) -> np.ndarray:
+        """
+        Удаление городов без перезапуска; оставшиеся города нумеруются
+        подряд в прежнем порядке. Списки кандидатов пересчитываются только
+        для городов, в списках которых были удаленные
+
+        Returns:
+            прежние номера оставшихся городов (city_map)
+        """
+        cities = np.unique(np.asarray(cities, dtype=np.intp))
+        if len(cities) and (cities[0] < 0 or cities[-1] >= self.n_cities):
+            raise ValueError("Номер удаляемого города вне диапазона")
+        keep = np.setdiff1d(np.arange(self.n_cities), cities)
+        if len(keep) < 3:
+            raise ValueError("После удаления должно остаться не меньше трех городов")
+        self._remap_cities(keep)
+        return keep
+
+    def _remap_cities(self, city_map: np.ndarray, distances: np.ndarray = None, coordinates: np.ndarray = None):
+        """
+        Перенос состояния решателя на новую нумерацию городов (city_map, см.
+        warm_start); distances или coordinates задают новые города
+        """
+        old_candidates = self.candidates
+        added = np.flatnonzero(city_map < 0)
+        known = np.flatnonzero(city_map >= 0)
+
+        if isinstance(self.distances, CoordinateDistances):
+            old = self.distances
+            points = old.coordinates[city_map[known]]
+            if coordinates is not None:
+                points = np.vstack([points, coordinates])
+            self.distances = CoordinateDistances(points, old.metric, old.block_size, old.cache_blocks)
+            self.distances.metric_name = old.metric_name
+        else:
+            self.distances = self._remap_matrix(self.distances, city_map, 0.0)
+            self._owns_distances = True
+        self.n_cities = len(city_map)
+
+        # Хранение 'candidates' переносится по новым спискам кандидатов, когда они построены
+        previous = self.pheromone
+        if self.storage != 'candidates':
+            self.pheromone = self._remap_matrix(self.pheromone, city_map, self._initial_pheromone_level())
+            if self.heuristic is not None:
+                self.heuristic = self._remap_matrix(self.heuristic, city_map, 0.0)
+            self.choice_info = self._remap_matrix(self.choice_info, city_map, 0.0)
+        if len(added):
+            rows, columns = np.broadcast_arrays(added[:, None], np.arange(self.n_cities)[None, :])
+            if distances is not None:
+                self._set_symmetric(self.distances, rows, columns, distances)
+            if self.storage != 'candidates':
+                self._refresh_pairs(rows, columns)
+
+        self.candidates = self._remap_neighbor_lists(self.candidates, city_map, added)
+        if self.local_search_neighbors is old_candidates:
+            self.local_search_neighbors = self.candidates
+        else:
+            self.local_search_neighbors = self._remap_neighbor_lists(self.local_search_neighbors, city_map, added)
+        if self.storage == 'candidates':
+            self._set_candidate_storage(previous, city_map)
+
+        if self.best_path is not None:
+            self._reset_best(remap_tour(self.best_path, city_map, self.distances))
+
+    def _remap_matrix(self, matrix, city_map: np.ndarray, fill_value: float):
+        """Матрица n x n в новой нумерации городов; элементы новых городов равны fill_value"""
+        if isinstance(matrix, PackedSymmetricMatrix):
+            return matrix.remapped(city_map, fill_value)
+        result = np.empty((len(city_map), len(city_map)), dtype=matrix.dtype)
+        added = np.flatnonzero(city_map < 0)
+        result[added, :] = fill_value
+        result[:, added] = fill_value
+        known = np.flatnonzero(city_map >= 0)
+        old = city_map[known]
+
+        # При добавлении и удалении городов сохраненные города идут непрерывными
+        # отрезками - блоки между ними копируются срезами, это быстрее выборки по индексам
+        breaks = np.flatnonzero((np.diff(known) != 1) | (np.diff(old) != 1)) + 1
+        runs = [(known[run[0]], old[run[0]], len(run)) for run in np.split(np.arange(len(known)), breaks) if len(run)]
+        if len(runs) > 32:
+            result[np.ix_(known, known)] = matrix[np.ix_(old, old)]
+            return result
+        for new_row, old_row, height in runs:
+            for new_column, old_column, width in runs:
+                result[new_row:new_row + height, new_column:new_column + width] = (
+                    matrix[old_row:old_row + height, old_column:old_column + width]
+                )
+        return result
+
+    def _remap_neighbor_lists(self, lists: np.ndarray, city_map: np.ndarray, added: np.ndarray) -> np.ndarray:
+        """Списки соседей в новой нумерации; пересчитываются только устаревшие строки"""
+        if lists is None:
+            return None
+        k = min(lists.shape[1], self.n_cities - 1)
+        if k != lists.shape[1]:
+            return self._build_candidate_lists(k)
+
+        known = np.flatnonzero(city_map >= 0)
+        new_index = np.full(len(lists), -1, dtype=np.intp)
+        new_index[city_map[known]] = known
+        result = np.empty((self.n_cities, k), dtype=np.intp)
+        result[known] = new_index[lists[city_map[known]]]
+        # Списки, из которых выпали удаленные города
+        stale = known[(result[known] < 0).any(axis=1)]
+        if len(added):
+            # Новый город попадает в список, если он ближе самого дальнего кандидата
+            current = known[(result[known] >= 0).all(axis=1)]
+            farthest = self.distances[current, result[current, -1]]
+            closer = (self.distances[current[:, None], added[None, :]] < farthest[:, None]).any(axis=1)
+            stale = np.union1d(stale, current[closer])
+        self._fill_neighbor_rows(result, np.concatenate([stale, added]).astype(np.intp))
+        return result
+
+    def _neighbor_lists(self) -> List[np.ndarray]:
+        """Различные списки соседей решателя (кандидаты и соседи локального поиска)"""
+        lists = [self.candidates] if self.candidates is not None else []
+        if self.local_search_neighbors is not None and self.local_search_neighbors is not self.candidates:
+            lists.append(self.local_search_neighbors)
+        return lists
+
+    def _set_symmetric(self, matrix, rows: np.ndarray, columns: np.ndarray, values):
+        """Запись значений в элементы (rows, columns) и симметричные им"""
+        matrix[rows, columns] = values
+        if isinstance(matrix, np.ndarray):
+            matrix[columns, rows] = values
+
+    def _refresh_pairs(self, rows: np.ndarray, columns: np.ndarray):
+        """Пересчет эвристики и привлекательности пар городов после изменения расстояний"""
+        if self.heuristic is not None:
+            # Эвристика диагонали может не поместиться в float32; она не используется
+            with np.errstate(over='ignore'):
+                self._set_symmetric(self.heuristic, rows, columns, self._eta_pairs(rows, columns))
+        self._set_symmetric(
+            self.choice_info, rows, columns,
+            self.pheromone[rows, columns] ** self.alpha * self._heuristic_pairs(rows, columns)
+        )
+
+    def _reset_best(self, path):
+        """Лучший маршрут после изменения задачи: пересчет длины, начало следующего решения"""
+        if path is None:
+            return
+        tour = self._evaluate_tours([path])[0]
+        self.best_path, self.best_distance = tour.path, tour.length
+        self._initial_best = (tour.path, tour.length)
+
+    def _eta(self, distances: np.ndarray) -> np.ndarray:
+        """Эвристика eta^beta для массива расстояний"""
+        return (1.0 / (distances + 1e-10)) ** self.beta
+
+    def _eta_pairs(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Эвристика eta^beta пар городов, вычисленная по расстояниям"""
+        return self._eta(self.distances[rows, columns])
+
+    def _heuristic_rows(self, start: int, stop: int) -> np.ndarray:
+        """Строки эвристики eta^beta с start по stop"""
+        if self.heuristic is not None:
+            return self.heuristic[start:stop]
+        return self._eta(self.distances[start:stop])
+
+    def _heuristic_pairs(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Эвристика eta^beta для пар городов"""
+        if self.heuristic is not None:
+            return self.heuristic[rows, columns]
+        return self._eta_pairs(rows, columns)
+
+    def _fill_choice_info(self, out: np.ndarray, block_size: int = 256) -> np.ndarray:
+        """Вычисление привлекательности переходов tau^alpha * eta^beta в массив out"""
+        if self.heuristic is not None:
+            # Поэлементная операция одинакова для плотных и упакованных матриц
+            np.multiply(
+                storage_values(self.pheromone) ** self.alpha,
+                storage_values(self.heuristic),
+                out=storage_values(out)
+            )
+            if isinstance(out, CandidateMatrix):
+                # Вне списков: уровень феромона в степени alpha, умноженный на эвристику по расстояниям
+                out.background = self.heuristic.background
+            return out
+        if isinstance(out, PackedSymmetricMatrix):
+            # Эвристика задачи по координатам вычисляется блоками строк сразу в упакованный массив
+            out.set_rows(self.distances, transform=self._eta)
+            np.multiply(out.values, self.pheromone.values ** self.alpha, out=out.values)
+            return out
+        for start in range(0, self.n_cities, block_size):
+            stop = min(start + block_size, self.n_cities)
+            np.multiply(self.pheromone[start:stop] ** self.alpha, self._heuristic_rows(start, stop), out=out[start:stop])
+        return out
+
+    def _update_choice_info(self):
+        """Пересчет кэша привлекательности переходов по текущим феромонам"""
+        self.choice_info = self._fill_choice_info(self._new_matrix())
+
+    def _construct_solution(self, seed) -> Tour:
+        """Построение решения одним муравьем по его зерну"""
+        exploitation = self.strategy == 'acs'
+        starts, uniforms, exploit = ant_random_numbers([seed], self.n_cities, exploitation=exploitation)
+        # Тот же выбор городов, что и в пакетном режиме, для группы из одного муравья
+        paths = build_tours(
+            self.choice_info, self.candidates, starts, uniforms, exploit=exploit, q0=self.q0,
+            on_step=self._acs_local_update if exploitation else None
+        )
+        return self._evaluate_tours(paths)[0]
+
+    def _construct_solutions(self) -> np.ndarray:
+        """Пакетное построение решений всеми муравьями одновременно"""
+        if self.strategy == 'acs':
+            # Локальное обновление меняет феромоны во время построения,
+            # поэтому ACS всегда строит маршруты реализацией на NumPy
+            starts, uniforms, exploit = ant_random_numbers(self._draw_ant_seeds(), self.n_cities, exploitation=True)
+            return build_tours(
+                self.choice_info, self.candidates, starts, uniforms,
+                exploit=exploit, q0=self.q0, on_step=self._acs_local_update
+            )
+
+        starts, uniforms, _ = ant_random_numbers(self._draw_ant_seeds(), self.n_cities)
+        if self._kernels is not None:
+            candidates = self.candidates
+            if candidates is None:
+                candidates = np.empty((self.n_cities, 0), dtype=np.intp)
+            return self._kernels.build_tours(self.choice_info, candidates, starts, uniforms)
+        return build_tours(self.choice_info, self.candidates, starts, uniforms)
+
+    def _draw_ant_seeds(self) -> List[np.random.SeedSequence]:
+        """
+        Зерна генераторов случайных чисел для муравьев текущей итерации.
+        Поток муравья определяется зерном колонии, номером итерации и номером
+        муравья, поэтому маршруты не зависят от того, как колония разбита на группы
+        """
+        spawn_key = self._seed_sequence.spawn_key + (self._seed_round,)
+        self._seed_round += 1
+        return [
+            np.random.SeedSequence(self._seed_sequence.entropy, spawn_key=spawn_key + (ant,))
+            for ant in range(self.n_ants)
+        ]
+
+    def _phase(self, name: str):
+        """Контекст замера фазы итерации (пустой без профилирования)"""
+        return self.profile.phase(name) if self.profile is not None else _NO_PROFILE
+
+    def _construct_tours(self) -> List[Tour]:
+        """Построение и оценка маршрутов всех муравьев итерации"""
+        if self.profile is not None:
+            self.profile.count('transitions', self.n_ants * (self.n_cities - 1))
+        if self.construction == 'vectorized':
+            return self._evaluate_tours(self._construct_solutions())
+        return [self._construct_solution(seed) for seed in self._draw_ant_seeds()]
+
+    def _improve_tours(self, tours: List[Tour], best_distance: float) -> List[Tour]:
+        """Применение локального поиска к маршрутам итерации согласно local_search_scope"""
+        if self.local_search is None:
+            return tours
+
+        if self.local_search_scope == 'all':
+            selected = range(len(tours))
+        else:
+            iteration_best = min(range(len(tours)), key=lambda ant: tours[ant].length)
+            selected = [iteration_best]
+            # Для 'global_best' улучшаем только маршрут, который становится новым лучшим
+            if self.local_search_scope == 'global_best' and tours[iteration_best].length >= best_distance:
+                selected = []
+
+        tours = list(tours)
+        for ant in selected:
+            path = self.local_search(tours[ant].path, self.distances, self.local_search_neighbors)
+            tours[ant] = self._evaluate_tours([path])[0]
+        return tours
+
+    def _evaluate_tours(self, paths) -> List[Tour]:
+        """Оценка маршрутов: длина каждого вычисляется по его собственной перестановке"""
+        if self.profile is not None:
+            self.profile.count('tours_evaluated', len(paths))
+        with self._phase('evaluation'):
+            lengths = self._tour_lengths(np.asarray(paths, dtype=np.intp))
+        return [Tour(path, length) for path, length in zip(paths, lengths.tolist())]
+
+    def _tour_lengths(self, paths: np.ndarray) -> np.ndarray:
+        """Длины замкнутых маршрутов для матрицы маршрутов"""
+        if self._kernels is not None and isinstance(self.distances, np.ndarray):
+            return self._kernels.tour_lengths(self.distances, paths)
+        return self.distances[paths, np.roll(paths, -1, axis=1)].sum(axis=1, dtype=np.float64)
+
+    def _acs_local_update(self, from_cities: np.ndarray, to_cities: np.ndarray):
+        """Локальное обновление ACS: пройденные ребра теряют часть феромона"""
+        rows = np.concatenate([from_cities, to_cities])
+        columns = np.concatenate([to_cities, from_cities])
+        self.pheromone[rows, columns] = (
+            (1 - self.local_decay) * self.pheromone[rows, columns] + self.local_decay * self.tau0
+        )
+        self.choice_info[rows, columns] = (
+            self.pheromone[rows, columns] ** self.alpha * self._heuristic_pairs(rows, columns)
+        )
 
     def _update_pheromone(self, paths: List[List[int]], distances: List[float]):
-        """Обновление феромонов на путях"""
+        """Обновление феромонов на путях согласно выбранной стратегии"""
+        if self.strategy == 'acs':
+            # Глобальное обновление ACS затрагивает только ребра лучшего маршрута
+            path = np.asarray(self.best_path, dtype=np.intp)
+            rows = np.concatenate([path, np.roll(path, -1)])
+            columns = np.concatenate([np.roll(path, -1), path])
+            self.pheromone[rows, columns] = (
+                (1 - self.decay) * self.pheromone[rows, columns] + self.decay / self.best_distance
+            )
+            self._update_choice_info()
+            return
+
         # Испарение феромона
-        self.pheromone *= (1 - self.decay)
-        
-        # Добавление нового феромона
-        for path, distance in zip(paths, distances):
-            for i in range(len(path)):
-                current_city = path[i]
-                next_city = path[(i + 1) % self.n_cities]
-                # Добавляем феромон пропорционально качеству решения
-                pheromone_amount = 1.0 / distance
-                self.pheromone[current_city][next_city] += pheromone_amount
-                self.pheromone[next_city][current_city] += pheromone_amount
+        pheromone = storage_values(self.pheromone)
+        pheromone *= (1 - self.decay)
 
-    def solve(self, stop_flag=None):
+        if self.strategy == 'mmas':
+            # Феромон откладывает только лучший муравей итерации
+            iteration_best = int(np.argmin(distances))
+            paths = [paths[iteration_best]]
+            distances = [distances[iteration_best]]
+
+        # Добавляем феромон пропорционально качеству решения
+        self._deposit(np.asarray(paths, dtype=np.intp), 1.0 / np.asarray(distances, dtype=float))
+
+        if self.strategy == 'mmas':
+            self._update_trail_limits(self.best_distance)
+            np.clip(pheromone, self.tau_min, self.tau_max, out=pheromone)
+
+        # Феромоны изменились - обновляем кэш привлекательности
+        self._update_choice_info()
+
+    def _deposit(self, paths: np.ndarray, amounts: np.ndarray):
+        """Симметричное добавление феромона на ребра маршрутов"""
+        if self._kernels is not None:
+            self._kernels.deposit_pheromone(self.pheromone, paths, amounts)
+        elif self.storage == 'packed':
+            # Ребро хранится один раз, поэтому феромон добавляется один раз
+            self.pheromone.add_at(
+                paths.ravel(), np.roll(paths, -1, axis=1).ravel(), np.repeat(amounts, paths.shape[1])
+            )
+        else:
+            # Ребра всех маршрутов собираются в массивы индексов
+            from_cities = paths.ravel()
+            to_cities = np.roll(paths, -1, axis=1).ravel()
+            amounts = np.repeat(amounts, paths.shape[1])
+            rows = np.concatenate([from_cities, to_cities])
+            columns = np.concatenate([to_cities, from_cities])
+
+            # Симметричное накопление: повторяющиеся ребра суммируются корректно
+            if self.storage == 'candidates':
+                # Феромон ребер вне списков кандидатов не хранится
+                self.pheromone.add_at(rows, columns, np.concatenate([amounts, amounts]))
+            else:
+                np.add.at(self.pheromone, (rows, columns), np.concatenate([amounts, amounts]))
+
+    def branching_factor(self, block_size: int = 256) -> float:
         """
-        Решение задачи коммивояжера
+        Средний лямбда-коэффициент ветвления матрицы феромонов: для каждого
+        города - число ребер с феромоном не ниже tau_min + lambda * (tau_max - tau_min)
+        по строке (в MMAS - по границам феромона). Значение около 2 означает,
+        что колония сошлась к одному маршруту
+        """
+        if isinstance(self.pheromone, CandidateMatrix):
+            return self._candidate_branching_factor()
+        counts = np.empty(self.n_cities)
+        for start in range(0, self.n_cities, block_size):
+            # Матрица обрабатывается блоками строк, чтобы не копировать ее целиком
+            pheromone = np.array(self.pheromone[start:start + block_size], dtype=float)
+            # Ребро города в самого себя не учитывается
+            pheromone[np.arange(len(pheromone)), np.arange(start, start + len(pheromone))] = np.nan
+            if self.strategy == 'mmas':
+                # В MMAS шкала задается границами феромона, а не значениями в строке:
+                # иначе после первой итерации все ребра вне лучшего маршрута равны между собой
+                row_min = np.full(len(pheromone), self.tau_min)
+                row_max = np.full(len(pheromone), self.tau_max)
+            else:
+                row_min = np.nanmin(pheromone, axis=1)
+                row_max = np.nanmax(pheromone, axis=1)
+            thresholds = row_min + self.branching_lambda * (row_max - row_min)
+            counts[start:start + len(pheromone)] = np.sum(pheromone >= thresholds[:, None], axis=1)
+        return float(np.mean(counts))
+
+    def _candidate_branching_factor(self) -> float:
+        """Коэффициент ветвления для хранения 'candidates': ребра вне списков имеют общий уровень"""
+        pheromone = self.pheromone.table.astype(float)
+        level = float(self.pheromone.level)
+        outside = self.n_cities - 1 - pheromone.shape[1]
+        if self.strategy == 'mmas':
+            row_min = np.full(len(pheromone), self.tau_min)
+            row_max = np.full(len(pheromone), self.tau_max)
+        else:
+            row_min = pheromone.min(axis=1)
+            row_max = pheromone.max(axis=1)
+            if outside:
+                row_min = np.minimum(row_min, level)
+                row_max = np.maximum(row_max, level)
+        thresholds = row_min + self.branching_lambda * (row_max - row_min)
+        counts = np.sum(pheromone >= thresholds[:, None], axis=1) + outside * (level >= thresholds)
+        return float(np.mean(counts))
+
+    def _stop_reason(self, best_distance: float, stagnation: int, start_time: float) -> str:
+        """Причина досрочной остановки после итерации или None, если нужно продолжать"""
+        if self.target_distance is not None and best_distance <= self.target_distance:
+            return 'target'
+        if self.stagnation_iterations is not None and stagnation >= self.stagnation_iterations:
+            return 'stagnation'
+        if self.min_branching_factor is not None and self.branching_factor() <= self.min_branching_factor:
+            return 'branching'
+        if self.time_limit is not None and time.time() - start_time >= self.time_limit:
+            return 'time_limit'
+        return None
+
+    def _checkpoint_parameters(self) -> dict:
+        """Параметры, от которых зависит ход решения (сверяются при продолжении)"""
+        return {
+            'n_cities': self.n_cities,
+            'n_ants': self.n_ants,
+            'decay': self.decay,
+            'alpha': self.alpha,
+            'beta': self.beta,
+            'strategy': self.strategy,
+            'p_best': self.p_best,
+            'q0': self.q0,
+            'local_decay': self.local_decay,
+            'candidate_list_size': self.candidate_list_size,
+            'local_search': getattr(self.local_search, '__name__', None),
+            'local_search_scope': self.local_search_scope,
+            'dtype': self.dtype.name,
+            'storage': self.storage
+        }
+
+    def _checkpoint_state(self, next_iteration: int, stagnation: int) -> dict:
+        """Копия состояния решателя для записи контрольной точки"""
+        return {
+            'pheromone': storage_values(self.pheromone).copy(),
+            'best_path': self.best_path,
+            'metadata': {
+                'iteration': next_iteration,
+                'stagnation': stagnation,
+                'best_distance': self.best_distance,
+                'tau_min': self.tau_min,
+                'tau_max': self.tau_max,
+                'seed_entropy': self._seed_sequence.entropy,
+                'spawn_key': list(self._seed_sequence.spawn_key),
+                'seed_round': self._seed_round,
+                'parameters': self._checkpoint_parameters()
+            }
+        }
+
+    def _restore_checkpoint(self, checkpoint: dict):
+        """Восстановление состояния из контрольной точки (см. checkpoint.load_checkpoint)"""
+        metadata = checkpoint['metadata']
+        parameters = self._checkpoint_parameters()
+        mismatched = [name for name, value in metadata['parameters'].items() if parameters.get(name) != value]
+        if mismatched:
+            raise ValueError(f"Параметры решателя не совпадают с контрольной точкой: {', '.join(mismatched)}")
+
+        storage_values(self.pheromone)[...] = checkpoint['pheromone']
+        self.best_path = checkpoint['best_path']
+        self.best_distance = metadata['best_distance']
+        self.tau_min = metadata['tau_min']
+        self.tau_max = metadata['tau_max']
+        self._seed_sequence = np.random.SeedSequence(metadata['seed_entropy'], spawn_key=tuple(metadata['spawn_key']))
+        self.seed = self._seed_sequence.entropy
+        self._seed_round = metadata['seed_round']
+        self._resume = (metadata['iteration'], metadata['stagnation'])
+        self._update_choice_info()
+
+    def iterate(self, stop_flag=None):
+        """
+        Решение задачи коммивояжера по итерациям: генератор записей IterationState
         stop_flag: функция, возвращающая True, если нужно остановить алгоритм
+
+        Матрица феромонов и маршруты муравьев не копируются, пока потребитель
+        не запросит их у записи. После завершения генератора лучший маршрут
+        и причина остановки доступны в best_path, best_distance и stop_reason
         """
-        best_path = None
-        best_distance = float('inf')
-        start_time = time.time()  # Начинаем замер времени
+        writer = CheckpointWriter(self.checkpoint_path) if self.checkpoint_path else None
+        try:
+            yield from self._iterate(stop_flag, writer)
+        finally:
+            if writer is not None:
+                writer.close()
+                if writer.error is not None:
+                    warnings.warn(f"Не удалось записать контрольную точку: {writer.error}")
+
+    def _iterate(self, stop_flag, writer: CheckpointWriter):
+        """Цикл итераций iterate(); writer - запись контрольных точек или None"""
+        # После загрузки контрольной точки решение продолжается с сохраненной итерации
+        first_iteration, stagnation = self._resume or (0, 0)
+        self._resume = None
+        if first_iteration == 0:
+            self.best_path, self.best_distance = self._initial_best
+        best_path = self.best_path
+        best_distance = self.best_distance
+        self.stop_reason = None
+        stop_reason = 'iterations'
+        if self.profile is not None:
+            self.profile.reset()
+        start_time = self.start_time = time.time()  # Начинаем замер времени
         
-        for iteration in range(self.n_iterations):
+        for iteration in range(first_iteration, self.n_iterations):
             # Проверяем флаг остановки
             if stop_flag and stop_flag():
+                stop_reason = 'stopped'
+                if writer is not None:
+                    writer.submit(self._checkpoint_state(iteration, stagnation))
                 break
                 
             # Отправляем муравьев на поиск пути
-            paths = []
-            distances = []
-            
-            for ant in range(self.n_ants):
-                path = self._construct_solution()[0]
-                distance = self._construct_solution()[1]
-                paths.append(path)
-                distances.append(distance)
-                
-                # Обновляем лучший путь
-                if distance < best_distance:
-                    best_distance = distance
-                    best_path = path.copy()
-            
+            with self._phase('construction'):
+                tours = self._construct_tours()
+            with self._phase('local_search'):
+                tours = self._improve_tours(tours, best_distance)
+
+            # Обновляем лучший путь
+            iteration_best = min(tours, key=lambda tour: tour.length)
+            stagnation += 1
+            improved = iteration_best.length < best_distance
+            if improved:
+                best_distance = iteration_best.length
+                best_path = list(iteration_best.path)
+                self.best_path = best_path
+                self.best_distance = best_distance
+                stagnation = 0
+                if self.profile is not None:
+                    self.profile.count('improvements')
+
             # Обновляем феромоны
-            self._update_pheromone(paths, distances)
+            with self._phase('pheromone_update'):
+                self._update_pheromone([tour.path for tour in tours], [tour.length for tour in tours])
             
+            # Отдаем запись потребителю; его время относится к фазе callback
+            with self._phase('callback'):
+                yield IterationState(self, iteration, tours, improved, time.time() - start_time)
+
+            # Проверяем критерии досрочной остановки
+            with self._phase('stop_criteria'):
+                reason = self._stop_reason(best_distance, stagnation, start_time)
+            # Копия состояния передается фоновой записи
+            last_iteration = reason or iteration + 1 == self.n_iterations
+            if writer is not None and ((iteration + 1) % self.checkpoint_every == 0 or last_iteration):
+                with self._phase('checkpoint'):
+                    writer.submit(self._checkpoint_state(iteration + 1, stagnation))
+            if self.profile is not None:
+                self.profile.end_iteration(iteration)
+            if reason:
+                stop_reason = reason
+                break
+
+        self.stop_reason = stop_reason
+
+    def solve(self, stop_flag=None):
+        """
+        Решение задачи коммивояжера
+        stop_flag: функция, возвращающая True, если нужно остановить алгоритм
+
+        Returns:
+            лучший маршрут, его длина, время решения и причина остановки:
+            'iterations' - выполнены все итерации, 'stopped' - сработал stop_flag,
+            'target' - достигнута целевая длина, 'stagnation' - нет улучшений,
+            'branching' - феромоны сошлись, 'time_limit' - исчерпано время
+        """
+        for state in self.iterate(stop_flag):
             # Вызываем callback с текущим состоянием
             if self.on_iteration:
                 self.on_iteration(
-                    iteration,
-                    self.pheromone.copy(),
-                    paths,
-                    distances,
-                    (best_path, best_distance)
+                    state.iteration,
+                    state.pheromone(),
+                    state.paths,
+                    state.distances,
+                    (state.best_path, state.best_distance)
                 )
-            
-            # Добавляем задержку если она указана
-            if self.delay:
-                time.sleep(self.delay)
 
-        execution_time = time.time() - start_time  # Завершаем замер времени
-        return best_path, best_distance, execution_time 
\ No newline at end of file
+        execution_time = time.time() - self.start_time  # Завершаем замер времени
+        return self.best_path, self.best_distance, execution_time, self.stop_reason
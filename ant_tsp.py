@@ -0,0 +1,266 @@
+"""
+Консольный (без графического интерфейса) запуск решателя
+
+Пример:
+    python -m ant_tsp solve distances.txt --parameters parameters.txt --repeats 5 --format csv
+
+Модуль не импортирует PyQt6 и matplotlib и подходит для вычислительных
+узлов без графической среды.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from ant_colony_tsp import AntColonyTSP
+from coordinates import METRICS, CoordinateDistances
+from local_search import LOCAL_SEARCH_METHODS
+from profiling import JsonLinesProfileLog
+from tsp_io import load_coordinates, read_distances, read_parameters
+
+# Параметры по умолчанию (как в примере parameters.txt)
+DEFAULT_PARAMETERS = {
+    'n_ants': 10,
+    'n_iterations': 100,
+    'decay': 0.1,
+    'alpha': 1.0,
+    'beta': 2.0
+}
+
+# Поля результата в порядке столбцов CSV
+RESULT_FIELDS = [
+    'instance', 'repeat', 'seed', 'n_cities', 'best_distance',
+    'execution_time', 'stop_reason', 'best_path', 'error'
+]
+
+def find_instances(inputs, manifest=None, pattern='distances*'):
+    """
+    Список задач в виде пар (файл расстояний, файл параметров или None)
+
+    Args:
+        inputs: пути к файлам расстояний или к папкам с ними
+        manifest: текстовый файл, в каждой строке которого путь к файлу расстояний
+            и (необязательно) через пробел путь к файлу параметров; пути считаются
+            относительно папки манифеста, строки с # пропускаются
+        pattern: шаблон имен файлов расстояний при обходе папок
+    """
+    instances = []
+    for path in inputs:
+        if os.path.isdir(path):
+            instances.extend((name, None) for name in sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            instances.append((path, None))
+
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if not fields:
+                    continue
+                paths = [os.path.join(base, field) for field in fields[:2]]
+                instances.append((paths[0], paths[1] if len(paths) > 1 else None))
+
+    return instances
+
+def load_instance(path, args):
+    """Матрица расстояний или (с --coordinates) расстояния по координатам"""
+    if args.coordinates:
+        return CoordinateDistances(load_coordinates(path), args.metric)
+    return read_distances(path)
+
+def solver_parameters(parameters, args):
+    """Параметры AntColonyTSP из файла параметров и аргументов командной строки"""
+    merged = dict(DEFAULT_PARAMETERS)
+    merged.update(parameters)
+    for name in DEFAULT_PARAMETERS:
+        if getattr(args, name) is not None:
+            merged[name] = getattr(args, name)
+    # Без итераций решатель не строит ни одного маршрута и возвращает пустой результат
+    for name in ('n_ants', 'n_iterations'):
+        if int(merged[name]) < 1:
+            raise ValueError(f"{name} должен быть не меньше 1")
+
+    return {
+        'n_ants': int(merged['n_ants']),
+        'n_iterations': int(merged['n_iterations']),
+        'decay': merged['decay'],
+        'alpha': merged['alpha'],
+        'beta': merged['beta'],
+        'strategy': args.strategy,
+        'construction': args.construction,
+        'backend': args.backend,
+        'candidate_list_size': args.candidate_list_size,
+        'local_search': args.local_search,
+        'stagnation_iterations': args.stagnation_iterations,
+        'target_distance': args.target_distance,
+        'time_limit': args.time_limit,
+        'dtype': args.dtype,
+        'storage': args.storage
+    }
+
+def solve_instance(distances, parameters, seed, **options):
+    """Один запуск решателя с заданным зерном (options - профилирование и контрольные точки)"""
+    aco = AntColonyTSP(distances=distances, seed=seed, **parameters, **options)
+    return aco.solve()
+
+def checkpoint_file(checkpoint_dir, distances_path, repeat):
+    """Файл контрольной точки повтора: имя строится из пути к задаче"""
+    name = os.path.splitext(os.path.normpath(distances_path))[0].strip(os.sep).replace(os.sep, '_').replace(':', '')
+    return os.path.join(checkpoint_dir, f"{name}_{repeat}.npz")
+
+def run_batch(instances, args, on_result=None, profile_log=None):
+    """
+    Решение всех задач с повторами
+
+    Args:
+        profile_log: функция f(record), получающая профиль каждой итерации
+            с полями instance и repeat (None - без профилирования)
+
+    Returns:
+        список словарей с полями RESULT_FIELDS; ошибки чтения и решения
+        записываются в поле error, остальные задачи продолжают решаться
+    """
+    default_parameters = read_parameters(args.parameters) if args.parameters else {}
+    results = []
+    for distances_path, parameters_path in instances:
+        try:
+            distances = load_instance(distances_path, args)
+            parameters = read_parameters(parameters_path) if parameters_path else default_parameters
+            parameters = solver_parameters(parameters, args)
+        except (OSError, ValueError) as error:
+            result = {'instance': distances_path, 'error': str(error)}
+            results.append(result)
+            if on_result:
+                on_result(result)
+            continue
+
+        for repeat in range(args.repeats):
+            seed = args.seed + repeat
+            result = {'instance': distances_path, 'repeat': repeat, 'seed': seed, 'n_cities': len(distances)}
+            options = {}
+            if profile_log is not None:
+                def profile_hook(record, run={'instance': distances_path, 'repeat': repeat}):
+                    profile_log({**run, **record})
+                options['profile_hook'] = profile_hook
+            if args.checkpoint_dir:
+                checkpoint = checkpoint_file(args.checkpoint_dir, distances_path, repeat)
+                options.update(checkpoint_path=checkpoint, checkpoint_every=args.checkpoint_every)
+                if args.resume and os.path.exists(checkpoint):
+                    options['resume_from'] = checkpoint
+            try:
+                best_path, best_distance, execution_time, stop_reason = solve_instance(
+                    distances, parameters, seed, **options
+                )
+                result.update({
+                    'best_distance': best_distance,
+                    'execution_time': execution_time,
+                    'stop_reason': stop_reason,
+                    'best_path': [int(city) for city in best_path]
+                })
+            except ValueError as error:
+                result['error'] = str(error)
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    return results
+
+def write_results(results, output, output_format):
+    """Запись результатов в формате JSON или CSV"""
+    if output_format == 'json':
+        json.dump(results, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+        return
+
+    writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS, lineterminator='\n')
+    writer.writeheader()
+    for result in results:
+        row = dict(result)
+        if 'best_path' in row:
+            row['best_path'] = ' '.join(str(city) for city in row['best_path'])
+        writer.writerow(row)
+
+def build_parser():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(prog='python -m ant_tsp', description="Решение задачи коммивояжера методом муравьиной колонии")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solve = commands.add_parser('solve', help="решить одну или несколько задач")
+    solve.add_argument('inputs', nargs='*', help="файлы расстояний или папки с ними")
+    solve.add_argument('--manifest', help="файл со списком задач (путь к расстояниям и, необязательно, к параметрам)")
+    solve.add_argument('--pattern', default='distances*', help="шаблон имен файлов расстояний в папках")
+    solve.add_argument('--coordinates', action='store_true', help="входные файлы содержат координаты городов, а не матрицу")
+    solve.add_argument('--metric', choices=sorted(METRICS), default='euclidean', help="метрика для координат")
+    solve.add_argument('--parameters', help="файл параметров по умолчанию для всех задач")
+    solve.add_argument('--seed', type=int, default=0, help="зерно первого повтора (повторы используют seed, seed+1, ...)")
+    solve.add_argument('--repeats', type=int, default=1, help="количество запусков каждой задачи")
+    solve.add_argument('--format', dest='output_format', choices=['json', 'csv'], default='json', help="формат результатов")
+    solve.add_argument('--output', '-o', help="файл результатов (по умолчанию - стандартный вывод)")
+
+    # Переопределение параметров из файла
+    solve.add_argument('--n-ants', dest='n_ants', type=int)
+    solve.add_argument('--n-iterations', dest='n_iterations', type=int)
+    solve.add_argument('--decay', type=float)
+    solve.add_argument('--alpha', type=float)
+    solve.add_argument('--beta', type=float)
+
+    # Параметры решателя, которых нет в файле параметров
+    solve.add_argument('--strategy', choices=['as', 'mmas', 'acs'], default='as')
+    solve.add_argument('--construction', choices=['vectorized', 'sequential'], default='vectorized')
+    solve.add_argument('--backend', choices=['numpy', 'numba'], default='numpy')
+    solve.add_argument('--candidate-list-size', type=int)
+    solve.add_argument('--local-search', choices=sorted(LOCAL_SEARCH_METHODS))
+    solve.add_argument('--stagnation-iterations', type=int)
+    solve.add_argument('--target-distance', type=float)
+    solve.add_argument('--time-limit', type=float, help="ограничение времени одного запуска в секундах")
+    solve.add_argument('--dtype', choices=['float64', 'float32'], default='float64', help="тип чисел матриц решателя")
+    solve.add_argument('--storage', choices=['dense', 'packed', 'candidates'], default='dense',
+                       help="хранение матриц: полные, верхний треугольник (вдвое меньше памяти) "
+                            "или только ребра списков кандидатов (нужен --candidate-list-size)")
+    solve.add_argument('--profile-log', help="файл JSON Lines для времени фаз и счетчиков каждой итерации")
+    solve.add_argument('--checkpoint-dir', help="папка для контрольных точек (по файлу на задачу и повтор)")
+    solve.add_argument('--checkpoint-every', type=int, default=10, help="период записи контрольных точек в итерациях")
+    solve.add_argument('--resume', action='store_true', help="продолжить решение с контрольных точек из --checkpoint-dir")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    instances = find_instances(args.inputs, args.manifest, args.pattern)
+    if not instances:
+        print("Не найдено ни одной задачи", file=sys.stderr)
+        return 2
+    if args.resume and not args.checkpoint_dir:
+        print("--resume требует --checkpoint-dir", file=sys.stderr)
+        return 2
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+
+    def report(result):
+        # Прогресс выводится в stderr, чтобы не смешиваться с результатами
+        if 'error' in result:
+            print(f"{result['instance']}: ошибка: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"{result['instance']} [{result['repeat']}]: {result['best_distance']:.4f} "
+                f"за {result['execution_time']:.2f} с ({result['stop_reason']})",
+                file=sys.stderr
+            )
+
+    if args.profile_log:
+        with JsonLinesProfileLog(args.profile_log) as profile_log:
+            results = run_batch(instances, args, on_result=report, profile_log=profile_log)
+    else:
+        results = run_batch(instances, args, on_result=report)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as output:
+            write_results(results, output, args.output_format)
+    else:
+        write_results(results, sys.stdout, args.output_format)
+
+    return 1 if any('error' in result for result in results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,32 +1,50 @@
 import sys
 import math
+import multiprocessing
+import os
 import random
+import threading
 import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, 
                            QPushButton, QVBoxLayout, QHBoxLayout,
                            QTextEdit, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtCore import Qt, QTimer, QPoint, QObject, QThread, pyqtSignal
 from PyQt6.QtGui import (QPainter, QPen, QColor, QFont, 
                         QBrush, qRgb)
 import numpy as np
 from ant_colony_tsp import AntColonyTSP
-from analytics_window import AnalyticsWindow
-
-def read_distances(filename):
-    distances = []
-    with open(filename, 'r') as f:
-        for line in f:
-            row = [float(x) for x in line.strip().split()]
-            distances.append(row)
-    return distances
-
-def read_parameters(filename):
-    parameters = {}
-    with open(filename, 'r') as f:
-        for line in f:
-            key, value = line.strip().split('=')
-            parameters[key] = float(value)
-    return parameters
+from coordinates import CoordinateDistances
+from tsp_io import load_coordinates, read_distances, read_parameters
+
+# Интервал между кадрами отрисовки состояния алгоритма (~30 кадров в секунду)
+FRAME_INTERVAL_MS = 33
+
+class SnapshotBuffer:
+    """
+    Одноместный буфер состояния алгоритма: решатель кладет в него последнее
+    состояние, а виджет забирает его с фиксированной частотой кадров.
+    Пока предыдущее состояние не забрано, решатель не готовит новое,
+    поэтому матрица феромонов копируется не чаще одного раза за кадр
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def publish(self, *snapshot):
+        """Сохранение нового состояния (вызывается из потока решателя)"""
+        with self._lock:
+            self._snapshot = snapshot
+
+    def wants_frame(self) -> bool:
+        """Забрано ли последнее состояние (нужно ли готовить новое)"""
+        with self._lock:
+            return self._snapshot is None
+
+    def take(self):
+        """Получение последнего состояния или None, если нового состояния нет"""
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+        return snapshot
 
 class Graph:
     def __init__(self):
@@ -71,6 +89,7 @@ class GraphWidget(QWidget, Graph):
         self.nodeColor = {}
         self.is_animating = False
         self.n_ants = 10  # Значение по умолчанию
+        self.coordinates = None  # Координаты городов, если задача задана ими
         
         # Переменные для финальной анимации
         self.current_edge_index = 0
@@ -84,6 +103,11 @@ class GraphWidget(QWidget, Graph):
         self.animation_timer = QTimer()
         self.animation_timer.timeout.connect(self.update_animation)
 
+        # Последнее состояние алгоритма и таймер кадров для его отрисовки
+        self.snapshot_buffer = SnapshotBuffer()
+        self.frame_timer = QTimer()
+        self.frame_timer.timeout.connect(self.render_latest_snapshot)
+
     def reset(self):
         """Сброс всех результатов и состояний визуализации"""
         self.node_positions = {}
@@ -104,12 +128,13 @@ class GraphWidget(QWidget, Graph):
         self.animation_completed = False
         self.update()
 
-    def set_cities(self, distances, n_ants=10):
+    def set_cities(self, distances, n_ants=10, coordinates=None):
         # Сначала очищаем все предыдущие данные
         self.reset()
         
-        # Сохраняем количество муравьев
+        # Сохраняем количество муравьев и координаты городов
         self.n_ants = n_ants
+        self.coordinates = coordinates
         
         # Создаем список смежности из матрицы расстояний
         adj_list = {}
@@ -157,7 +182,22 @@ class GraphWidget(QWidget, Graph):
                 main_window.result_text.setText(text)
         
         self.update()
-        QApplication.processEvents()
+
+    def start_rendering(self):
+        """Запуск отрисовки состояний алгоритма с фиксированной частотой кадров"""
+        self.snapshot_buffer.take()
+        self.frame_timer.start(FRAME_INTERVAL_MS)
+
+    def stop_rendering(self):
+        """Остановка таймера кадров с отрисовкой последнего состояния"""
+        self.frame_timer.stop()
+        self.render_latest_snapshot()
+
+    def render_latest_snapshot(self):
+        """Отрисовка самого нового состояния, если оно появилось после прошлого кадра"""
+        snapshot = self.snapshot_buffer.take()
+        if snapshot is not None:
+            self.on_iteration(*snapshot)
 
     def update_animation(self):
         """Обновление анимации"""
@@ -291,6 +331,8 @@ class GraphWidget(QWidget, Graph):
             painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, str(node))
 
     def calculate_node_positions(self):
+        if self.coordinates is not None:
+            return self.calculate_coordinate_positions()
         positions = {}
         radius = min(self.width(), self.height()) / 2.5
         center_x, center_y = self.width() / 2.0, self.height() / 2.0
@@ -303,6 +345,24 @@ class GraphWidget(QWidget, Graph):
             positions[node] = QPoint(round(x), round(y))
         return positions
 
+    def calculate_coordinate_positions(self):
+        """Расположение городов по их координатам с сохранением пропорций"""
+        positions = {}
+        margin = 40
+        points = np.asarray(self.coordinates, dtype=float)
+        minimum = points.min(axis=0)
+        span = np.maximum(points.max(axis=0) - minimum, 1e-10)
+        scale = min((self.width() - 2 * margin) / span[0], (self.height() - 2 * margin) / span[1])
+        offset_x = (self.width() - span[0] * scale) / 2.0
+        offset_y = (self.height() - span[1] * scale) / 2.0
+
+        for node in self.nodes:
+            x = offset_x + (points[node, 0] - minimum[0]) * scale
+            # Ось y экрана направлена вниз
+            y = self.height() - offset_y - (points[node, 1] - minimum[1]) * scale
+            positions[node] = QPoint(round(x), round(y))
+        return positions
+
     def resizeEvent(self, event):
         self.node_positions = self.calculate_node_positions()
         self.update()
@@ -343,6 +403,44 @@ class GraphWidget(QWidget, Graph):
             return Qt.GlobalColor.black
         return Qt.GlobalColor.white
 
+class SolverWorker(QObject):
+    """Запуск алгоритма в отдельном потоке"""
+    # Лучший путь, длина лучшего пути, время выполнения
+    finished = pyqtSignal(object, float, float)
+
+    def __init__(self, aco, cancel_event, snapshot_buffer):
+        super().__init__()
+        self.aco = aco
+        self.cancel_event = cancel_event
+        self.snapshot_buffer = snapshot_buffer
+
+    def publish(self, state):
+        """Передача состояния итерации виджету (копия феромонов делается здесь)"""
+        self.snapshot_buffer.publish(
+            state.iteration,
+            state.pheromone(),
+            state.paths,
+            state.distances,
+            (state.best_path, state.best_distance)
+        )
+
+    def run(self):
+        best_path, best_distance, execution_time = None, float('inf'), 0.0
+        try:
+            state = None
+            # Решатель не ждет отрисовки и готовит состояние, только когда виджет забрал прошлое
+            for state in self.aco.iterate(stop_flag=self.cancel_event.is_set):
+                if self.snapshot_buffer.wants_frame():
+                    self.publish(state)
+            # Последнее состояние показывается всегда
+            if state is not None:
+                self.publish(state)
+            best_path, best_distance = self.aco.best_path, self.aco.best_distance
+            execution_time = time.time() - self.aco.start_time
+        finally:
+            # Сообщаем о завершении и при ошибке, чтобы интерфейс вернулся в исходное состояние
+            self.finished.emit(best_path, best_distance, execution_time)
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -485,25 +583,40 @@ class MainWindow(QMainWindow):
 
         # Инициализация переменных для данных
         self.distances = None
+        self.coordinates = None
         self.parameters = None
         self.aco = None
 
+        # Поток решателя и признак отмены
+        self.solver_thread = None
+        self.solver_worker = None
+        self.cancel_event = threading.Event()
+
     def show_analytics(self):
         """Показать окно аналитики"""
         # Скрываем главное окно перед созданием окна аналитики
         self.hide()
         QApplication.processEvents()  # Обрабатываем все отложенные события
         
+        # Окно аналитики (и вместе с ним matplotlib) загружается при первом открытии
+        from analytics_window import AnalyticsWindow
+
         # Создаем новое окно аналитики каждый раз
         if self.analytics_window is not None:
             self.analytics_window.close()
+        # Окно аналитики показывается само, когда данные для графиков собраны
         self.analytics_window = AnalyticsWindow(self)
-        self.analytics_window.show()  # Показываем окно аналитики
 
     def load_files(self):
         try:
-            # Читаем новые данные
-            self.distances = read_distances('distances.txt')
+            # Читаем новые данные: координаты городов, если есть coordinates.txt,
+            # иначе матрицу расстояний
+            self.coordinates = None
+            if os.path.exists('coordinates.txt'):
+                self.coordinates = load_coordinates('coordinates.txt')
+                self.distances = CoordinateDistances(self.coordinates)
+            else:
+                self.distances = read_distances('distances.txt')
             self.parameters = read_parameters('parameters.txt')
             
             # Если окно аналитики существует, закрываем его
@@ -540,7 +653,8 @@ class MainWindow(QMainWindow):
             # Настройка отображения графа с передачей количества муравьев
             self.graph_widget.set_cities(
                 self.distances,
-                n_ants=int(self.parameters['n_ants'])
+                n_ants=int(self.parameters['n_ants']),
+                coordinates=self.coordinates
             )
             
             # Активация кнопок
@@ -551,12 +665,11 @@ class MainWindow(QMainWindow):
             self.result_text.setText(f"Ошибка при чтении файлов: {e}")
 
     def start_animation(self):
-        # Если алгоритм уже запущен, останавливаем его
+        # Если алгоритм уже запущен, запрашиваем остановку;
+        # результат будет показан, когда поток решателя завершится
         if self.is_running:
-            self.is_running = False
-            self.animate_button.setText("Начать анимацию")
-            self.load_button.setEnabled(True)
-            self.graph_widget.is_animating = False
+            self.cancel_event.set()
+            self.animate_button.setEnabled(False)
             return
 
         if self.distances is None or self.parameters is None:
@@ -567,74 +680,91 @@ class MainWindow(QMainWindow):
         self.animate_button.setText("Остановить")
         self.is_running = True
 
-        try:
-            # Очищаем текстовое поле перед началом анимации
-            self.result_text.clear()
+        # Очищаем текстовое поле перед началом анимации
+        self.result_text.clear()
+        
+        # Сбрасываем состояние предыдущей анимации
+        self.graph_widget.animation_completed = False
+        self.graph_widget.current_edge_index = 0
+        self.graph_widget.edge_animation_step = 0
+        self.graph_widget.edges_to_draw = []
+        
+        # Устанавливаем флаг анимации
+        self.graph_widget.is_animating = True
+        
+        # Создание экземпляра ACO
+        self.aco = AntColonyTSP(
+            distances=self.distances,
+            n_ants=int(self.parameters['n_ants']),
+            n_iterations=int(self.parameters['n_iterations']),
+            decay=self.parameters['decay'],
+            alpha=self.parameters['alpha'],
+            beta=self.parameters['beta']
+        )
+
+        # Дожидаемся полного завершения потока предыдущего запуска
+        if self.solver_thread is not None:
+            self.solver_thread.wait()
+
+        # Решение задачи в отдельном потоке
+        self.cancel_event = threading.Event()
+        self.solver_thread = QThread()
+        self.solver_worker = SolverWorker(self.aco, self.cancel_event, self.graph_widget.snapshot_buffer)
+        self.solver_worker.moveToThread(self.solver_thread)
+        self.solver_thread.started.connect(self.solver_worker.run)
+        self.solver_worker.finished.connect(self.on_solver_finished)
+        self.solver_worker.finished.connect(self.solver_thread.quit)
+        self.graph_widget.start_rendering()
+        self.solver_thread.start()
+
+    def on_solver_finished(self, best_path, best_distance, execution_time):
+        """Обработка завершения работы алгоритма в GUI-потоке"""
+        # Показываем последнее состояние и завершаем анимацию феромонов
+        self.graph_widget.stop_rendering()
+        self.graph_widget.is_animating = False
+
+        # Если алгоритм не был остановлен, показываем результат
+        if not self.cancel_event.is_set() and best_path is not None:
+            # Конвертируем путь в стандартные Python числа
+            best_path = [int(x) for x in best_path]
             
-            # Сбрасываем состояние предыдущей анимации
-            self.graph_widget.animation_completed = False
-            self.graph_widget.current_edge_index = 0
-            self.graph_widget.edge_animation_step = 0
-            self.graph_widget.edges_to_draw = []
+            # Формируем информацию о найденном решении
+            result_text = "Алгоритм завершил работу\n\n"
+            result_text += f"Найден оптимальный путь:\n{best_path + [best_path[0]]}\n\n"
+            result_text += f"Длина пути: {best_distance:.2f}\n"
+            result_text += f"Время выполнения: {execution_time:.2f} сек."
+            self.result_text.setText(result_text)
             
-            # Устанавливаем флаг анимации
-            self.graph_widget.is_animating = True
+            # Запускаем анимацию отрисовки пути
+            self.graph_widget.show_final_result()
+        elif best_path is not None:
+            # Если алгоритм был остановлен, выводим текущий лучший результат
+            best_path = [int(x) for x in best_path]
             
-            # Создание экземпляра ACO с функцией обратного вызова
-            self.aco = AntColonyTSP(
-                distances=self.distances,
-                n_ants=int(self.parameters['n_ants']),
-                n_iterations=int(self.parameters['n_iterations']),
-                decay=self.parameters['decay'],
-                alpha=self.parameters['alpha'],
-                beta=self.parameters['beta'],
-                on_iteration=self.graph_widget.on_iteration,
-                delay=0.1  # Добавляем задержку
-            )
+            result_text = "Алгоритм остановлен пользователем\n\n"
+            result_text += f"Текущий лучший путь:\n{best_path + [best_path[0]]}\n\n"
+            result_text += f"Длина пути: {best_distance:.2f}\n"
+            result_text += f"Время до остановки: {execution_time:.2f} сек."
+            self.result_text.setText(result_text)
+            # Показываем анимацию текущего лучшего пути
+            self.graph_widget.show_final_result()
+        elif self.cancel_event.is_set():
+            self.result_text.setText("Алгоритм остановлен пользователем (решение не найдено)")
+        else:
+            self.result_text.setText("Решение не найдено")
 
-            # Решение задачи
-            best_path, best_distance, execution_time = self.aco.solve(stop_flag=lambda: not self.is_running)
-            
-            # Если алгоритм не был остановлен, показываем результат
-            if self.is_running:
-                # Завершаем анимацию и показываем финальный результат
-                self.graph_widget.is_animating = False
-                
-                # Конвертируем путь в стандартные Python числа
-                best_path = [int(x) for x in best_path]
-                
-                # Формируем информацию о найденном решении
-                result_text = "Алгоритм завершил работу\n\n"
-                result_text += f"Найден оптимальный путь:\n{best_path + [best_path[0]]}\n\n"
-                result_text += f"Длина пути: {best_distance:.2f}\n"
-                result_text += f"Время выполнения: {execution_time:.2f} сек."
-                self.result_text.setText(result_text)
-                
-                # Запускаем анимацию отрисовки пути
-                self.graph_widget.show_final_result()
-            else:
-                # Если алгоритм был остановлен, выводим текущий лучший результат
-                self.graph_widget.is_animating = False
-                if best_path is not None:
-                    # Конвертируем путь в стандартные Python числа
-                    best_path = [int(x) for x in best_path]
-                    
-                    result_text = "Алгоритм остановлен пользователем\n\n"
-                    result_text += f"Текущий лучший путь:\n{best_path + [best_path[0]]}\n\n"
-                    result_text += f"Длина пути: {best_distance:.2f}\n"
-                    result_text += f"Время до остановки: {execution_time:.2f} сек."
-                    self.result_text.setText(result_text)
-                    # Показываем анимацию текущего лучшего пути
-                    self.graph_widget.show_final_result()
-                else:
-                    self.result_text.setText("Алгоритм остановлен пользователем (решение не найдено)")
+        # Возвращаем кнопки в исходное состояние
+        self.is_running = False
+        self.animate_button.setText("Начать анимацию")
+        self.load_button.setEnabled(True)
+        self.animate_button.setEnabled(True)
 
-        finally:
-            # Возвращаем кнопки в исходное состояние
-            self.is_running = False
-            self.animate_button.setText("Начать анимацию")
-            self.load_button.setEnabled(True)
-            self.animate_button.setEnabled(True)
+    def closeEvent(self, event):
+        # Останавливаем решатель и дожидаемся завершения его потока
+        if self.solver_thread is not None:
+            self.cancel_event.set()
+            self.solver_thread.wait()
+        event.accept()
 
 def main():
     app = QApplication(sys.argv)
@@ -643,4 +773,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Поддержка пула процессов в собранном exe-файле
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Сравнение реализаций NumPy и Numba внутренних циклов AntColonyTSP
+
+Для каждой реализации выполняется прогревочный запуск (компиляция ядер Numba),
+затем замеряется время итерации. При одинаковом зерне реализации должны
+найти одинаковый лучший маршрут.
+
+Запуск из корня проекта:
+    python benchmarks/bench_backends.py --cities 500 --ants 50 --iterations 5
+"""
+import argparse
+import importlib.util
+import sys
+import time
+import numpy as np
+
+from common import random_instance
+
+from ant_colony_tsp import AntColonyTSP
+
+def run(distances, args, backend, n_iterations):
+    aco = AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=n_iterations,
+        candidate_list_size=args.candidates,
+        backend=backend,
+        seed=args.seed
+    )
+    start = time.perf_counter()
+    best_path, best_distance, _, _ = aco.solve()
+    return (time.perf_counter() - start) / n_iterations, best_path, best_distance
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=500)
+    parser.add_argument('--ants', type=int, default=50)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--candidates', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if importlib.util.find_spec('numba') is None:
+        print("Numba не установлена - сравнение пропущено")
+        return
+
+    distances = random_instance(args.cities, args.seed)
+    results = {}
+    for backend in ('numpy', 'numba'):
+        run(distances, args, backend, 1)
+        results[backend] = run(distances, args, backend, args.iterations)
+        print(f"{backend:<6} time={results[backend][0]:.4f}s/iter  best={results[backend][2]:.6f}")
+
+    numpy_time, numpy_path, numpy_distance = results['numpy']
+    numba_time, numba_path, numba_distance = results['numba']
+    identical = list(numpy_path) == list(numba_path) and np.isclose(numpy_distance, numba_distance)
+    print(f"speedup={numpy_time / numba_time:.2f}x  identical={identical}")
+    if not identical:
+        sys.exit("Реализации NumPy и Numba дали разные результаты")
+
+if __name__ == '__main__':
+    main()
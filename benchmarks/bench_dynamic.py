@@ -0,0 +1,100 @@
+"""
+Изменение задачи на ходу: дообучение работающего решателя против холодного старта
+
+Решатель решает задачу, после чего задача меняется: растут расстояния
+нескольких ребер (пробки), добавляются города, удаляются города. Для каждого
+изменения сравниваются:
+    incremental - update_distances / add_cities / remove_cities у работающего
+                  решателя и --resolve-iterations итераций
+    cold        - новый AntColonyTSP по измененной задаче и столько же итераций
+Выводится время подготовки (изменение или создание решателя), время
+повторного решения и найденная длина.
+
+Запуск из корня проекта:
+    python benchmarks/bench_dynamic.py --cities 1500 --iterations 30 --resolve-iterations 10
+"""
+import argparse
+import time
+import numpy as np
+
+from common import distance_matrix
+
+from ant_colony_tsp import AntColonyTSP
+
+def solver_options(args, n_iterations):
+    return dict(
+        n_ants=args.ants,
+        n_iterations=n_iterations,
+        strategy=args.strategy,
+        candidate_list_size=args.candidates,
+        seed=args.seed
+    )
+
+def measure(prepare, n_iterations):
+    """(время подготовки, время решения, длина) для prepare() -> решатель"""
+    start = time.perf_counter()
+    aco = prepare()
+    aco.n_iterations = n_iterations
+    prepared = time.perf_counter()
+    _, best_distance, _, _ = aco.solve()
+    return prepared - start, time.perf_counter() - prepared, best_distance
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=1500)
+    parser.add_argument('--changes', type=int, default=5, help="сколько ребер, добавленных и удаленных городов")
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=30, help="итерации исходного решения")
+    parser.add_argument('--resolve-iterations', type=int, default=10)
+    parser.add_argument('--strategy', choices=['as', 'mmas', 'acs'], default='mmas')
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    points = rng.random((args.cities + args.changes, 2))
+    distances = distance_matrix(points[:args.cities])
+    aco = AntColonyTSP(distances, **solver_options(args, args.iterations))
+    aco.solve()
+
+    # Пробки: расстояния нескольких ребер лучшего маршрута растут втрое
+    path = np.asarray(aco.best_path)
+    edge = rng.choice(args.cities, args.changes, replace=False)
+    rows, columns = path[edge], path[(edge + 1) % args.cities]
+    congested = distances.copy()
+    congested[rows, columns] *= 3
+    congested[columns, rows] *= 3
+
+    extended = distance_matrix(points)
+    extended[:args.cities, :args.cities] = congested
+    removed = rng.choice(args.cities, args.changes, replace=False)
+    keep = np.setdiff1d(np.arange(len(points)), removed)
+    reduced = extended[np.ix_(keep, keep)]
+
+    def update_distances():
+        aco.update_distances(rows, columns, congested[rows, columns])
+        return aco
+
+    def add_cities():
+        aco.add_cities(extended[args.cities:])
+        return aco
+
+    def remove_cities():
+        aco.remove_cities(removed)
+        return aco
+
+    # Изменения применяются к одному решателю последовательно, как в течение дня
+    for name, incremental, instance in (
+        ('update_distances', update_distances, congested),
+        ('add_cities', add_cities, extended),
+        ('remove_cities', remove_cities, reduced)
+    ):
+        for mode, prepare in (
+            ('incremental', incremental),
+            ('cold', lambda: AntColonyTSP(instance, **solver_options(args, args.resolve_iterations)))
+        ):
+            setup, solve, best_distance = measure(prepare, args.resolve_iterations)
+            print(f"{name:<17} {mode:<12} setup={setup:.3f}s  resolve={solve:.3f}s  best={best_distance:.4f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Время импорта модулей решателя и проверка ленивых импортов
+
+Каждый модуль импортируется в отдельном процессе с флагом -X importtime.
+Проверяется, что модули решателя не загружают PyQt6 и matplotlib, а app.py
+не загружает matplotlib до открытия окна аналитики, и что время импорта
+не превышает заданного порога (берется лучшее из нескольких запусков).
+
+Запуск из корня проекта:
+    python benchmarks/bench_import_time.py --repeats 5 --max-ms 500
+"""
+import argparse
+import importlib.util
+import subprocess
+import sys
+
+from common import ROOT
+
+# Модуль -> пакеты верхнего уровня, которые он не должен загружать
+CHECKS = {
+    'ant_colony_tsp': ('PyQt6', 'matplotlib'),
+    'analytics_utils': ('PyQt6', 'matplotlib'),
+    'ant_tsp': ('PyQt6', 'matplotlib'),
+    'app': ('matplotlib',)
+}
+
+def import_profile(module):
+    """Загруженные модули и суммарное время импорта модуля в миллисекундах"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать {module}:\n{result.stderr}")
+
+    loaded = {}
+    for line in result.stderr.splitlines():
+        # Формат строки: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded[name.strip()] = int(cumulative) / 1000.0
+    return loaded, loaded[module]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=500.0, help="порог времени импорта модулей решателя")
+    args = parser.parse_args()
+
+    failures = []
+    for module, forbidden in CHECKS.items():
+        if module == 'app' and importlib.util.find_spec('PyQt6') is None:
+            print(f"{module:<16} пропущен: PyQt6 не установлена")
+            continue
+
+        timings = []
+        for _ in range(args.repeats):
+            loaded, elapsed = import_profile(module)
+            timings.append(elapsed)
+        best = min(timings)
+
+        heavy = sorted({name.split('.')[0] for name in loaded} & set(forbidden))
+        print(f"{module:<16} {best:8.1f} ms  лишние импорты: {', '.join(heavy) or 'нет'}")
+        if heavy:
+            failures.append(f"{module} импортирует {', '.join(heavy)}")
+        # Графический интерфейс неизбежно загружает PyQt6, порог времени к нему не применяется
+        if module != 'app' and best > args.max_ms:
+            failures.append(f"{module} импортируется {best:.1f} ms (порог {args.max_ms:.0f} ms)")
+
+    if failures:
+        sys.exit('\n'.join(failures))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Стоимость получения результатов итераций: on_iteration против iterate()
+
+on_iteration получает копию матрицы феромонов и списки маршрутов на каждой
+итерации. iterate() выдает легкие записи, и потребитель, которому нужна только
+длина лучшего маршрута (кривая сходимости), не платит за копирование.
+Для сравнения показан и потребитель iterate(), запрашивающий феромоны.
+
+Запуск из корня проекта:
+    python benchmarks/bench_iterate.py --cities 2000 --ants 10 --iterations 10
+"""
+import argparse
+import time
+
+from common import random_instance
+
+from ant_colony_tsp import AntColonyTSP
+
+def make_solver(distances, args):
+    return AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=args.iterations,
+        candidate_list_size=args.candidates,
+        seed=args.seed
+    )
+
+def run_callback(aco):
+    history = []
+    aco.on_iteration = lambda iteration, pheromone, paths, lengths, best: history.append(best[1])
+    aco.solve()
+    return history
+
+def run_iterate(aco):
+    return [state.best_distance for state in aco.iterate()]
+
+def run_iterate_pheromone(aco):
+    history = []
+    for state in aco.iterate():
+        state.pheromone()
+        history.append(state.best_distance)
+    return history
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=2000)
+    parser.add_argument('--ants', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    distances = random_instance(args.cities, args.seed)
+    reference = None
+    for name, consumer in (
+        ('on_iteration', run_callback),
+        ('iterate', run_iterate),
+        ('iterate+pheromone', run_iterate_pheromone)
+    ):
+        aco = make_solver(distances, args)
+        start = time.perf_counter()
+        history = consumer(aco)
+        per_iteration = (time.perf_counter() - start) / len(history)
+        reference = reference or history
+        print(f"{name:<18} {per_iteration:.4f}s/iter  same_history={history == reference}")
+
+if __name__ == '__main__':
+    main()
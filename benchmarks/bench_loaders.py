@@ -0,0 +1,64 @@
+"""
+Скорость загрузки матрицы расстояний в разных форматах
+
+Сравнивается прежнее построчное чтение текста в список списков (с последующим
+np.array в решателе) и загрузчик tsp_io.load_distances для текста, .npy и .f32.
+Все варианты должны дать одинаковую матрицу.
+
+Запуск из корня проекта:
+    python benchmarks/bench_loaders.py --cities 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+from common import random_instance
+
+from tsp_io import load_distances, save_distances
+
+def read_lines(filename):
+    """Построчное чтение текста в список списков (прежняя реализация)"""
+    distances = []
+    with open(filename, 'r') as f:
+        for line in f:
+            distances.append([float(x) for x in line.strip().split()])
+    return np.array(distances)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Значения в float32, чтобы все форматы хранили одну и ту же матрицу
+    distances = random_instance(args.cities, args.seed).astype(np.float32).astype(float)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {extension: os.path.join(directory, 'distances' + extension) for extension in ('.txt', '.npy', '.f32')}
+        for path in paths.values():
+            save_distances(path, distances)
+
+        cases = [
+            ('text, построчно', read_lines, paths['.txt']),
+            ('text, loadtxt', load_distances, paths['.txt']),
+            ('.npy', load_distances, paths['.npy']),
+            ('.f32, memmap', lambda path: np.asarray(load_distances(path), dtype=float), paths['.f32'])
+        ]
+        baseline = None
+        for label, loader, path in cases:
+            elapsed, loaded = timed(loader, path)
+            baseline = baseline or elapsed
+            identical = np.array_equal(np.asarray(loaded, dtype=float), distances)
+            print(f"{label:<16} {elapsed:8.3f}s  speedup={baseline / elapsed:7.1f}x  identical={identical}")
+            if not identical:
+                sys.exit(f"Загрузчик '{label}' прочитал другую матрицу")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Время до качества: AntColonyTSP с локальным поиском и без него
+
+Для каждой конфигурации печатается лучшая длина, время решения и номер
+итерации, на которой впервые достигнута длина не хуже целевой
+(по умолчанию - лучшей длины запуска без локального поиска).
+
+Запуск из корня проекта:
+    python benchmarks/bench_local_search.py --cities 200 --ants 20 --iterations 50
+"""
+import argparse
+import time
+
+from common import random_instance
+
+from ant_colony_tsp import AntColonyTSP
+
+CONFIGURATIONS = [
+    (None, 'all'),
+    ('2-opt', 'all'),
+    ('2-opt', 'iteration_best'),
+    ('2-opt', 'global_best'),
+    ('2-opt+or-opt', 'iteration_best')
+]
+
+def run(distances, args, local_search, scope):
+    history = []
+    aco = AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=args.iterations,
+        decay=0.2,
+        alpha=1.0,
+        beta=3.0,
+        candidate_list_size=15,
+        local_search=local_search,
+        local_search_scope=scope,
+        seed=args.seed,
+        on_iteration=lambda iteration, pheromone, paths, lengths, best: history.append(best[1])
+    )
+    start = time.perf_counter()
+    _, best_distance, _, _ = aco.solve()
+    return best_distance, time.perf_counter() - start, history
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=200)
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--target', type=float, default=None)
+    args = parser.parse_args()
+
+    distances = random_instance(args.cities, args.seed)
+    results = [(config, run(distances, args, *config)) for config in CONFIGURATIONS]
+    target = args.target if args.target is not None else results[0][1][0]
+
+    print(f"target length = {target:.4f}")
+    for (local_search, scope), (best_distance, elapsed, history) in results:
+        reached = next((i + 1 for i, value in enumerate(history) if value <= target), None)
+        print(f"{str(local_search):<13} {scope:<15} best={best_distance:9.4f}  "
+              f"time={elapsed:7.2f}s  iterations to target={reached}")
+
+if __name__ == '__main__':
+    main()
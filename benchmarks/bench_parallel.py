@@ -0,0 +1,56 @@
+"""
+Масштабирование ParallelAntColonyTSP по числу процессов
+
+Запуск из корня проекта:
+    python benchmarks/bench_parallel.py --cities 300 --ants 64 --iterations 5
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+from common import random_instance
+
+from ant_colony_tsp import AntColonyTSP
+from parallel_colony import ParallelAntColonyTSP
+
+def run(solver_class, distances, args, **kwargs):
+    aco = solver_class(
+        distances,
+        n_ants=args.ants,
+        n_iterations=args.iterations,
+        candidate_list_size=args.candidates,
+        seed=args.seed,
+        **kwargs
+    )
+    start = time.perf_counter()
+    best_path, best_distance, _, _ = aco.solve()
+    return time.perf_counter() - start, best_path, best_distance
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=300)
+    parser.add_argument('--ants', type=int, default=64)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--candidates', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    distances = random_instance(args.cities, args.seed)
+    serial_time, serial_path, serial_distance = run(AntColonyTSP, distances, args)
+    print(f"serial      time={serial_time:8.3f}s  best={serial_distance:.4f}")
+
+    workers = 1
+    while workers <= args.max_workers:
+        elapsed, path, distance = run(ParallelAntColonyTSP, distances, args, workers=workers)
+        identical = distance == serial_distance and np.array_equal(path, serial_path)
+        print(f"workers={workers:<3} time={elapsed:8.3f}s  speedup={serial_time / elapsed:5.2f}x  "
+              f"identical={identical}")
+        if not identical:
+            sys.exit("Результат параллельного режима отличается от последовательного")
+        workers *= 2
+
+if __name__ == '__main__':
+    main()
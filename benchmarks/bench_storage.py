@@ -0,0 +1,73 @@
+"""
+Память и скорость при разных способах хранения матриц AntColonyTSP
+
+Сравниваются плотные матрицы float64 (по умолчанию), плотные float32,
+упакованный верхний треугольник и хранение только ребер списков кандидатов
+(float64 и float32). Память - суммарный объем матриц решателя (расстояния,
+феромоны, эвристика, привлекательность, списки кандидатов). С --coordinates
+задача задается координатами: расстояния и эвристика не хранятся, и в режиме
+candidates объем памяти растет линейно с числом городов.
+
+Запуск из корня проекта:
+    python benchmarks/bench_storage.py --cities 2000 --ants 20 --iterations 3
+    python benchmarks/bench_storage.py --cities 5000 --coordinates
+"""
+import argparse
+import time
+
+from common import random_instance, random_points
+
+from ant_colony_tsp import AntColonyTSP
+from coordinates import CoordinateDistances
+
+MODES = [
+    ('float64', 'dense'),
+    ('float32', 'dense'),
+    ('float64', 'packed'),
+    ('float32', 'packed'),
+    ('float64', 'candidates'),
+    ('float32', 'candidates')
+]
+
+def matrices_nbytes(aco):
+    """Суммарный объем матриц решателя в байтах"""
+    matrices = (aco.distances, aco.pheromone, aco.heuristic, aco.choice_info, aco.candidates)
+    return sum(matrix.nbytes for matrix in matrices if matrix is not None)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=2000)
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--coordinates', action='store_true', help="задача по координатам вместо матрицы")
+    args = parser.parse_args()
+
+    if args.coordinates:
+        distances = CoordinateDistances(random_points(args.cities, args.seed))
+    else:
+        distances = random_instance(args.cities, args.seed)
+    baseline = None
+    for dtype, storage in MODES:
+        aco = AntColonyTSP(
+            distances,
+            n_ants=args.ants,
+            n_iterations=args.iterations,
+            candidate_list_size=args.candidates,
+            dtype=dtype,
+            storage=storage,
+            seed=args.seed
+        )
+        memory = matrices_nbytes(aco) / 2 ** 20
+        start = time.perf_counter()
+        _, best_distance, _, _ = aco.solve()
+        per_iteration = (time.perf_counter() - start) / args.iterations
+        baseline = baseline or (memory, per_iteration)
+        print(
+            f"{dtype:<8} {storage:<10} memory={memory:9.1f}MB ({baseline[0] / memory:.1f}x less)  "
+            f"time={per_iteration:.3f}s/iter ({per_iteration / baseline[1]:.2f}x)  best={best_distance:.4f}"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Регрессионная проверка оценки маршрутов
+
+Сравнивает прежний цикл муравьев, в котором маршрут строился дважды
+(один раз ради пути, второй раз ради длины), с текущим построением,
+и проверяет, что каждая записанная длина соответствует своему маршруту.
+
+Запуск из корня проекта:
+    python benchmarks/bench_tour_evaluation.py --cities 60 --ants 20 --iterations 10
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from common import random_instance
+
+from ant_colony_tsp import AntColonyTSP
+
+def path_length(distances, path):
+    """Длина замкнутого маршрута, посчитанная независимо от решателя"""
+    return sum(distances[path[i]][path[(i + 1) % len(path)]] for i in range(len(path)))
+
+def legacy_ant_loop(aco):
+    """Прежний цикл муравьев: два построения маршрута на одного муравья"""
+    paths, distances = [], []
+    for seed in aco._draw_ant_seeds():
+        paths.append(aco._construct_solution(seed)[0])
+        distances.append(aco._construct_solution(seed)[1])
+    return paths, distances
+
+def time_per_iteration(function, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations
+
+def check_recorded_lengths(distances, args, construction):
+    """Проверка, что все длины, переданные в callback и в результат, соответствуют путям"""
+    mismatches = 0
+
+    def on_iteration(iteration, pheromone, paths, lengths, current_best):
+        nonlocal mismatches
+        for path, length in zip(paths, lengths):
+            if not np.isclose(path_length(distances, path), length):
+                mismatches += 1
+
+    aco = AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=args.iterations,
+        on_iteration=on_iteration,
+        construction=construction,
+        seed=args.seed
+    )
+    best_path, best_distance, _, _ = aco.solve()
+    if not np.isclose(path_length(distances, best_path), best_distance):
+        mismatches += 1
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=60)
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-speedup', type=float, default=1.5)
+    args = parser.parse_args()
+
+    distances = random_instance(args.cities, args.seed)
+    aco = AntColonyTSP(distances, n_ants=args.ants, construction='sequential')
+
+    legacy = time_per_iteration(lambda: legacy_ant_loop(aco), args.iterations)
+    current = time_per_iteration(aco._construct_tours, args.iterations)
+    speedup = legacy / current
+    print(f"sequential: legacy={legacy:.4f}s/iter  current={current:.4f}s/iter  speedup={speedup:.2f}x")
+
+    failed = speedup < args.min_speedup
+    for construction in ('sequential', 'vectorized'):
+        mismatches = check_recorded_lengths(distances, args, construction)
+        print(f"{construction}: length/path mismatches={mismatches}")
+        failed = failed or mismatches > 0
+
+    if failed:
+        sys.exit("Регрессия оценки маршрутов")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Набор эталонных задач TSPLIB с известными оптимумами
+
+Для каждой задачи из папки benchmarks/tsplib (или перечисленных в --instances)
+AntColonyTSP запускается несколько раз с разными зернами. Отчет содержит время,
+число итераций в секунду, отклонение от оптимума и пиковый объем памяти
+(tracemalloc, отдельный короткий запуск). Результаты сохраняются в JSON, чтобы
+сравнивать версии: с --baseline текущий прогон сравнивается с сохраненным, и
+скрипт завершается с ошибкой при замедлении или ухудшении качества.
+
+В папке лежат gr17 (матрица расстояний), eil51, berlin52 и kroA100. Оптимум
+берется из KNOWN_OPTIMA или вычисляется по файлу <имя>.opt.tour; задачи
+ch150, pcb442, att532 и др. достаточно положить в папку benchmarks/tsplib -
+их оптимумы уже известны скрипту.
+
+Запуск из корня проекта:
+    python benchmarks/bench_tsplib.py --repeats 3 --iterations 100 --output tsplib_results.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+
+from common import ROOT
+
+from ant_colony_tsp import AntColonyTSP
+from tsplib import read_tour, read_tsplib, tour_length
+
+INSTANCES_DIR = os.path.join(ROOT, 'benchmarks', 'tsplib')
+
+# Длины оптимальных маршрутов (TSPLIB)
+KNOWN_OPTIMA = {
+    'burma14': 3323,
+    'gr17': 2085,
+    'att48': 10628,
+    'eil51': 426,
+    'berlin52': 7542,
+    'st70': 675,
+    'eil76': 538,
+    'pr76': 108159,
+    'rat99': 1211,
+    'kroA100': 21282,
+    'eil101': 629,
+    'lin105': 14379,
+    'ch130': 6110,
+    'ch150': 6528,
+    'kroA200': 29368,
+    'a280': 2579,
+    'pcb442': 50778,
+    'att532': 27686,
+    'gr666': 294358
+}
+
+def instance_paths(names):
+    """Пути к файлам .tsp: по именам или все файлы из INSTANCES_DIR"""
+    if not names:
+        return sorted(glob.glob(os.path.join(INSTANCES_DIR, '*.tsp')))
+    return [name if name.endswith('.tsp') else os.path.join(INSTANCES_DIR, name + '.tsp') for name in names]
+
+def optimum_length(name, path, distances):
+    """Известный оптимум задачи или длина маршрута из .opt.tour (None, если неизвестен)"""
+    if name in KNOWN_OPTIMA:
+        return KNOWN_OPTIMA[name]
+    tour_path = os.path.splitext(path)[0] + '.opt.tour'
+    if os.path.exists(tour_path):
+        return tour_length(read_tour(tour_path), distances)
+    return None
+
+def make_solver(distances, args, n_iterations, seed=None):
+    return AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=n_iterations,
+        decay=args.decay,
+        alpha=args.alpha,
+        beta=args.beta,
+        strategy=args.strategy,
+        candidate_list_size=args.candidates,
+        local_search=args.local_search,
+        backend=args.backend,
+        seed=seed
+    )
+
+def run_once(distances, args, seed):
+    """Один запуск: (длина, время, выполнено итераций)"""
+    aco = make_solver(distances, args, args.iterations, seed)
+    iterations = 0
+
+    def count(*_):
+        nonlocal iterations
+        iterations += 1
+
+    aco.on_iteration = count
+    start = time.perf_counter()
+    _, best_distance, _, _ = aco.solve()
+    return best_distance, time.perf_counter() - start, iterations
+
+def peak_memory_mb(distances, args):
+    """Пиковый объем памяти (МБ) на создание решателя и две итерации"""
+    tracemalloc.start()
+    try:
+        make_solver(distances, args, 2).solve()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+def benchmark_instance(path, args):
+    problem = read_tsplib(path)
+    optimum = optimum_length(problem.name, path, problem.distances)
+
+    runs = [run_once(problem.distances, args, args.seed + repeat) for repeat in range(args.repeats)]
+    lengths = [length for length, _, _ in runs]
+    wall_times = [elapsed for _, elapsed, _ in runs]
+    iterations = sum(count for _, _, count in runs)
+
+    def gap(length):
+        return None if optimum is None else 100.0 * (length - optimum) / optimum
+
+    return {
+        'instance': problem.name,
+        'n_cities': problem.dimension,
+        'edge_weight_type': problem.edge_weight_type,
+        'optimum': optimum,
+        'best_length': min(lengths),
+        'mean_length': float(np.mean(lengths)),
+        'best_gap_pct': gap(min(lengths)),
+        'mean_gap_pct': gap(float(np.mean(lengths))),
+        'mean_wall_time': float(np.mean(wall_times)),
+        'iterations_per_second': iterations / sum(wall_times),
+        'peak_memory_mb': peak_memory_mb(problem.distances, args),
+        'lengths': lengths
+    }
+
+def git_commit():
+    """Текущий коммит репозитория (None вне git)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_with_baseline(results, baseline_path, max_slowdown, max_gap_increase):
+    """Список регрессий относительно сохраненного прогона"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {result['instance']: result for result in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['instance'])
+        if previous is None:
+            continue
+        slowdown = previous['iterations_per_second'] / result['iterations_per_second']
+        if slowdown > max_slowdown:
+            regressions.append(f"{result['instance']}: в {slowdown:.2f} раза медленнее")
+        if result['mean_gap_pct'] is not None and previous['mean_gap_pct'] is not None:
+            increase = result['mean_gap_pct'] - previous['mean_gap_pct']
+            if increase > max_gap_increase:
+                regressions.append(f"{result['instance']}: отклонение от оптимума выросло на {increase:.2f} п.п.")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--instances', nargs='*', help="имена задач из benchmarks/tsplib или пути к .tsp")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--ants', type=int, default=25)
+    parser.add_argument('--decay', type=float, default=0.1)
+    parser.add_argument('--alpha', type=float, default=1.0)
+    parser.add_argument('--beta', type=float, default=2.0)
+    parser.add_argument('--strategy', choices=['as', 'mmas', 'acs'], default='mmas')
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--local-search', default=None)
+    parser.add_argument('--backend', choices=['numpy', 'numba'], default='numpy')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='tsplib_results.json', help="файл результатов JSON")
+    parser.add_argument('--baseline', help="результаты предыдущего прогона для сравнения")
+    parser.add_argument('--max-slowdown', type=float, default=1.25)
+    parser.add_argument('--max-gap-increase', type=float, default=1.0, help="допустимый рост отклонения, п.п.")
+    args = parser.parse_args()
+
+    paths = instance_paths(args.instances)
+    if not paths:
+        sys.exit(f"Не найдено задач TSPLIB в {INSTANCES_DIR}")
+
+    results = []
+    for path in paths:
+        result = benchmark_instance(path, args)
+        results.append(result)
+        gap = '-' if result['mean_gap_pct'] is None else f"{result['mean_gap_pct']:.2f}%"
+        print(
+            f"{result['instance']:<10} n={result['n_cities']:<5} best={result['best_length']:<10.0f} "
+            f"gap={gap:<8} time={result['mean_wall_time']:.2f}s  "
+            f"it/s={result['iterations_per_second']:.1f}  mem={result['peak_memory_mb']:.1f}MB"
+        )
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'settings': {key: value for key, value in vars(args).items()
+                     if key not in ('output', 'baseline', 'max_slowdown', 'max_gap_increase')},
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты записаны в {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_slowdown, args.max_gap_increase)
+        if regressions:
+            sys.exit('\n'.join(regressions))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Теплый старт после изменения задачи
+
+Задача решается, затем в нее добавляется --added новых городов. Измененная
+задача решается заново с холодного старта и с теплого (феромоны и лучший
+маршрут прошлого решения, перенесенные через city_map), а также с жадного
+начального маршрута. Для каждого варианта выводится лучшая длина и номер
+итерации, на которой достигнута длина, найденная холодным стартом.
+
+Запуск из корня проекта:
+    python benchmarks/bench_warm_start.py --cities 300 --added 3 --iterations 100
+"""
+import argparse
+
+from common import distance_matrix, random_points
+
+from ant_colony_tsp import AntColonyTSP
+
+def convergence(distances, args, **kwargs):
+    """Кривая лучшей длины по итерациям"""
+    aco = AntColonyTSP(
+        distances,
+        n_ants=args.ants,
+        n_iterations=args.iterations,
+        strategy=args.strategy,
+        candidate_list_size=args.candidates,
+        seed=args.seed,
+        **kwargs
+    )
+    return [state.best_distance for state in aco.iterate()], aco
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cities', type=int, default=300)
+    parser.add_argument('--added', type=int, default=3)
+    parser.add_argument('--ants', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--strategy', choices=['as', 'mmas', 'acs'], default='mmas')
+    parser.add_argument('--candidates', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    points = random_points(args.cities + args.added, args.seed)
+    _, previous = convergence(distance_matrix(points[:args.cities]), args)
+    distances = distance_matrix(points)
+    city_map = list(range(args.cities)) + [-1] * args.added
+
+    cold, _ = convergence(distances, args)
+    variants = [
+        ('cold', cold),
+        ('warm', convergence(
+            distances, args,
+            initial_pheromone=previous.pheromone, seed_tour=previous.best_path, city_map=city_map
+        )[0]),
+        ('nearest_neighbor', convergence(distances, args, seed_tour='nearest_neighbor')[0])
+    ]
+    for name, history in variants:
+        reached = next((iteration + 1 for iteration, length in enumerate(history) if length <= cold[-1]), None)
+        print(f"{name:<17} first={history[0]:.4f}  best={history[-1]:.4f}  cold-best reached at iteration {reached}")
+
+if __name__ == '__main__':
+    main()
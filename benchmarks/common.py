@@ -0,0 +1,26 @@
+"""
+Общие функции скриптов замеров
+
+Импорт модуля добавляет корень проекта в sys.path, поэтому скрипты,
+запущенные как python benchmarks/bench_*.py, импортируют модули решателя
+после import common.
+"""
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+def random_points(n_cities, seed=0):
+    """Случайные точки в единичном квадрате"""
+    return np.random.default_rng(seed).random((n_cities, 2))
+
+def distance_matrix(points):
+    """Матрица евклидовых расстояний между точками"""
+    return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+
+def random_instance(n_cities, seed=0):
+    """Случайный евклидов экземпляр задачи"""
+    return distance_matrix(random_points(n_cities, seed))
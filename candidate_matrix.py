@@ -0,0 +1,142 @@
+"""
+Хранение матриц только на ребрах списков кандидатов
+
+CandidateMatrix хранит по k значений на город - для ребер (i, candidates[i, p]) -
+в таблице формы (n, k), выровненной со списками кандидатов, и одно общее
+значение level для всех остальных ребер. Вместе они лежат в одномерном массиве
+values длины n * k + 1 (level - последний элемент), поэтому поэлементные
+операции над values (испарение, ограничение значений, вычисление
+привлекательности) обрабатывают и таблицу, и общий уровень.
+
+Значения ребер вне списков вычисляются при обращении: level, умноженный на
+background(rows, columns), если функция background задана (так эвристика
+задачи по координатам получается из расстояний, а не хранится). Элемент (i, j)
+берется из списка города i, то есть матрица читается по строкам и в общем
+случае не симметрична. Запись и добавление в ребра вне списков пропускаются.
+Индексация повторяет плотную матрицу: m[i, j], m[i], m[rows] (строки),
+m[start:stop] и выборки пар m[rows, columns].
+"""
+import numpy as np
+
+class CandidateMatrix:
+    def __init__(self, candidates: np.ndarray, values: np.ndarray, background=None):
+        """
+        Матрица n x n, хранящая значения только для ребер списков кандидатов
+
+        Args:
+            candidates: списки кандидатов формы (n, k)
+            values: значения ребер списков по строкам и общий уровень остальных
+                ребер последним элементом, длина n * k + 1
+            background: функция f(rows, columns) -> множители значений ребер
+                вне списков (None - все они равны level)
+        """
+        if len(values) != candidates.size + 1:
+            raise ValueError(f"Для списков кандидатов {candidates.shape} нужно {candidates.size + 1} значений, получено {len(values)}")
+        self.candidates = candidates
+        self.values = values
+        self.background = background
+
+    @classmethod
+    def full(cls, candidates: np.ndarray, value: float, dtype=np.float64):
+        return cls(candidates, np.full(candidates.size + 1, value, dtype=dtype))
+
+    @classmethod
+    def empty(cls, candidates: np.ndarray, dtype=np.float64):
+        return cls(candidates, np.empty(candidates.size + 1, dtype=dtype))
+
+    def __len__(self):
+        return len(self.candidates)
+
+    @property
+    def shape(self):
+        return (len(self), len(self))
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    @property
+    def table(self) -> np.ndarray:
+        """Значения ребер списков, форма (n, k); представление values без копирования"""
+        return self.values[:-1].reshape(self.candidates.shape)
+
+    @property
+    def level(self) -> float:
+        """Общее значение ребер вне списков"""
+        return self.values[-1]
+
+    @level.setter
+    def level(self, value: float):
+        self.values[-1] = value
+
+    def copy(self):
+        return CandidateMatrix(self.candidates.copy(), self.values.copy(), self.background)
+
+    def fill(self, value: float):
+        self.values.fill(value)
+
+    def _positions(self, rows: np.ndarray, columns: np.ndarray):
+        """Позиции columns в списках rows и признак того, что ребро есть в списке"""
+        matches = self.candidates[rows] == columns[..., None]
+        return np.argmax(matches, axis=-1), matches.any(axis=-1)
+
+    def _outside(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Значения ребер вне списков"""
+        if self.background is None:
+            return np.full(np.broadcast(rows, columns).shape, self.level, dtype=self.dtype)
+        # Для ребра города в самого себя множитель может не поместиться в float32; он не используется
+        with np.errstate(over='ignore'):
+            return (self.level * self.background(rows, columns)).astype(self.dtype, copy=False)
+
+    def rows(self, rows) -> np.ndarray:
+        """Плотные строки rows (массив номеров городов), форма (len(rows), n)"""
+        rows = np.asarray(rows)
+        result = self._outside(rows[:, None], np.arange(len(self))[None, :])
+        result[np.arange(len(rows))[:, None], self.candidates[rows]] = self.table[rows]
+        return result
+
+    def pairs(self, rows, columns) -> np.ndarray:
+        """Элементы (rows[i], columns[i]) для массивов любой формы"""
+        rows, columns = np.broadcast_arrays(np.asarray(rows), np.asarray(columns))
+        positions, found = self._positions(rows, columns)
+        result = np.empty(rows.shape, dtype=self.dtype)
+        result[found] = self.table[rows[found], positions[found]]
+        result[~found] = self._outside(rows[~found], columns[~found])
+        return result
+
+    def add_at(self, rows, columns, amounts):
+        """Добавление amounts к ребрам (rows[i], columns[i]) списков; повторяющиеся ребра суммируются"""
+        rows, columns, amounts = np.broadcast_arrays(np.asarray(rows), np.asarray(columns), np.asarray(amounts))
+        positions, found = self._positions(rows, columns)
+        np.add.at(self.table, (rows[found], positions[found]), amounts[found])
+
+    def to_dense(self) -> np.ndarray:
+        return self.rows(np.arange(len(self)))
+
+    def __array__(self, dtype=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, columns = key
+            if isinstance(rows, slice) or isinstance(columns, slice):
+                return self[rows][..., columns]
+            if np.ndim(rows) == 0 and np.ndim(columns) == 0:
+                return self.pairs(rows, columns)[()]
+            return self.pairs(rows, columns)
+        if isinstance(key, slice):
+            return self.rows(np.arange(len(self))[key])
+        if np.ndim(key) == 0:
+            return self.rows(np.array([key]))[0]
+        return self.rows(key)
+
+    def __setitem__(self, key, value):
+        rows, columns = key
+        rows, columns, value = np.broadcast_arrays(np.asarray(rows), np.asarray(columns), np.asarray(value))
+        positions, found = self._positions(rows, columns)
+        self.table[rows[found], positions[found]] = value[found]
@@ -0,0 +1,89 @@
+"""
+Контрольные точки решателя
+
+Состояние AntColonyTSP (матрица феромонов, лучший маршрут, номер итерации,
+счетчик застоя, состояние генератора случайных чисел и параметры) хранится
+в файле .npz без pickle. Скалярные значения записываются строкой JSON.
+Файл сначала пишется во временный и затем атомарно заменяет прежний, поэтому
+прерванная запись не портит последнюю контрольную точку.
+
+CheckpointWriter записывает контрольные точки в фоновом потоке: цикл итераций
+только передает ему копию состояния. Если предыдущая запись еще идет,
+ожидающее состояние заменяется более новым.
+"""
+import json
+import os
+import threading
+import numpy as np
+
+def save_checkpoint(filename: str, state: dict):
+    """
+    Запись контрольной точки
+
+    Args:
+        state: массивы 'pheromone' и 'best_path' и словарь 'metadata'
+            со значениями, сериализуемыми в JSON
+    """
+    temporary = filename + '.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez(
+            f,
+            pheromone=state['pheromone'],
+            best_path=np.asarray(state['best_path'] if state['best_path'] is not None else [], dtype=np.int64),
+            metadata=np.array(json.dumps(state['metadata']))
+        )
+    os.replace(temporary, filename)
+
+def load_checkpoint(filename: str) -> dict:
+    """Чтение контрольной точки в словарь того же вида, что принимает save_checkpoint"""
+    with np.load(filename, allow_pickle=False) as data:
+        metadata = json.loads(str(data['metadata']))
+        best_path = data['best_path'].tolist()
+        return {
+            'pheromone': data['pheromone'],
+            'best_path': best_path if best_path else None,
+            'metadata': metadata
+        }
+
+class CheckpointWriter:
+    def __init__(self, filename: str):
+        """
+        Фоновая запись контрольных точек в файл filename
+
+        Args:
+            filename: путь к файлу .npz
+        """
+        self.filename = filename
+        self.error = None
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, state: dict):
+        """Постановка состояния в очередь записи (массивы не должны меняться после вызова)"""
+        with self._condition:
+            self._pending = state
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                state, self._pending = self._pending, None
+                if state is None:
+                    return
+            try:
+                save_checkpoint(self.filename, state)
+            except OSError as error:
+                # Ошибка записи не прерывает решение
+                self.error = error
+
+    def close(self):
+        """Дожидается записи последнего состояния и завершает поток; ошибка записи остается в error"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
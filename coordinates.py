@@ -0,0 +1,117 @@
+"""
+Задачи, заданные координатами городов
+
+CoordinateDistances ведет себя как матрица расстояний (поддерживает len,
+shape и индексацию d[i, j], d[i], d[start:stop], d[rows, columns]), но не
+хранит n x n значений: расстояния вычисляются по координатам при обращении,
+строки кэшируются блоками. Решатель строит по такому объекту списки
+кандидатов и длины маршрутов блоками строк и векторными выборками пар.
+"""
+from collections import OrderedDict
+import numpy as np
+
+# Радиус Земли в километрах для географических координат
+EARTH_RADIUS_KM = 6371.0
+
+def euclidean(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Евклидово расстояние между точками (x, y) с поэлементным вещанием"""
+    return np.sqrt(((a - b) ** 2).sum(axis=-1))
+
+def great_circle(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Расстояние по дуге большого круга в км между точками (широта, долгота) в градусах"""
+    lat_a, lon_a = np.radians(a[..., 0]), np.radians(a[..., 1])
+    lat_b, lon_b = np.radians(b[..., 0]), np.radians(b[..., 1])
+    h = np.sin((lat_b - lat_a) / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin((lon_b - lon_a) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+# Встроенные метрики по имени
+METRICS = {
+    'euclidean': euclidean,
+    'geo': great_circle
+}
+
+class CoordinateDistances:
+    def __init__(self, coordinates, metric='euclidean', block_size: int = 256, cache_blocks: int = 16):
+        """
+        Расстояния между городами, вычисляемые по координатам
+
+        Args:
+            coordinates: массив координат формы (n_cities, 2): (x, y) или
+                (широта, долгота) в градусах для метрики 'geo'
+            metric: 'euclidean', 'geo' или функция f(a, b) -> расстояния,
+                вычисляющая расстояния между точками массивов a и b с вещанием
+            block_size: количество строк в кэшируемом блоке
+            cache_blocks: сколько блоков строк хранить в кэше
+        """
+        if isinstance(metric, str) and metric not in METRICS:
+            raise ValueError(f"Неизвестная метрика: {metric}")
+        coordinates = np.asarray(coordinates, dtype=float)
+        if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+            raise ValueError(f"Координаты должны иметь форму (n, 2), получена форма {coordinates.shape}")
+
+        self.coordinates = coordinates
+        self.metric_name = metric if isinstance(metric, str) else getattr(metric, '__name__', 'custom')
+        self.metric = METRICS.get(metric, metric)
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    @property
+    def shape(self):
+        return (len(self), len(self))
+
+    @property
+    def nbytes(self):
+        """Объем памяти координат (для сравнения с плотной матрицей)"""
+        return self.coordinates.nbytes
+
+    def __getstate__(self):
+        # Кэш не передается в другие процессы
+        state = self.__dict__.copy()
+        state['_cache'] = OrderedDict()
+        return state
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """Строки матрицы расстояний с start по stop (не включая), без кэширования"""
+        return self.metric(self.coordinates[start:stop, None, :], self.coordinates[None, :, :])
+
+    def pairs(self, rows, columns) -> np.ndarray:
+        """Расстояния между городами rows[i] и columns[i] (массивы любой формы)"""
+        return self.metric(self.coordinates[rows], self.coordinates[columns])
+
+    def row(self, city: int) -> np.ndarray:
+        """Строка матрицы расстояний из кэша блоков"""
+        block = city // self.block_size
+        rows = self._cache.get(block)
+        if rows is None:
+            rows = self.rows(block * self.block_size, (block + 1) * self.block_size)
+            # Строки из кэша отдаются без копирования, поэтому запрещаем запись
+            rows.flags.writeable = False
+            self._cache[block] = rows
+            if len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(block)
+        return rows[city - block * self.block_size]
+
+    def to_matrix(self) -> np.ndarray:
+        """Полная матрица расстояний (только для небольших задач)"""
+        return self.rows(0, len(self))
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, columns = key
+            if isinstance(rows, slice) or isinstance(columns, slice):
+                return self[rows][..., columns]
+            if np.ndim(rows) == 0 and np.ndim(columns) == 0:
+                return float(self.metric(self.coordinates[rows], self.coordinates[columns]))
+            return self.pairs(rows, columns)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            return self.rows(start, stop)[::step]
+        if np.ndim(key) == 0:
+            return self.row(int(key))
+        return self.metric(self.coordinates[np.asarray(key), None, :], self.coordinates[None, :, :])
@@ -0,0 +1,150 @@
+"""
+Локальный поиск для улучшения маршрутов муравьев
+
+Все функции имеют одинаковый интерфейс:
+    improve(path, distances, neighbors) -> улучшенный маршрут
+где neighbors - списки ближайших соседей каждого города, отсортированные
+по возрастанию расстояния.
+"""
+from collections import deque
+import numpy as np
+
+def _reverse(tour: list, position: list, start: int, end: int):
+    """
+    Разворот участка маршрута с позиции start по позицию end (по кругу).
+    Если участок длиннее половины маршрута, разворачивается дополнение -
+    получается тот же замкнутый маршрут, пройденный в обратную сторону
+    """
+    n = len(tour)
+    length = (end - start) % n + 1
+    if 2 * length > n:
+        start, end = (end + 1) % n, (start - 1) % n
+        length = n - length
+    for _ in range(length // 2):
+        tour[start], tour[end] = tour[end], tour[start]
+        position[tour[start]] = start
+        position[tour[end]] = end
+        start = (start + 1) % n
+        end = (end - 1) % n
+
+def two_opt(path, distances: np.ndarray, neighbors: np.ndarray) -> list:
+    """
+    2-opt со списками соседей и битами "не смотреть"
+
+    Город проверяется, только пока он в очереди активных городов; после
+    улучшения в очередь возвращаются концы измененных ребер.
+    """
+    tour = [int(city) for city in path]
+    n = len(tour)
+    if n < 4:
+        return tour
+    position = [0] * n
+    for index, city in enumerate(tour):
+        position[city] = index
+    neighbor_lists = [[int(c) for c in row] for row in neighbors]
+
+    queue = deque(tour)
+    active = [True] * n
+    while queue:
+        a = queue.popleft()
+        active[a] = False
+
+        improved = False
+        for step in (1, -1):
+            # step = 1: ребра (a, a_next) и (c, c_next); step = -1: предшественники
+            a_next = tour[(position[a] + step) % n]
+            d_a = distances[a, a_next]
+            for c in neighbor_lists[a]:
+                d_ac = distances[a, c]
+                # Соседи отсортированы: дальше выигрыша быть не может
+                if d_ac >= d_a:
+                    break
+                c_next = tour[(position[c] + step) % n]
+                if c == a_next or c_next == a:
+                    continue
+                delta = d_ac + distances[a_next, c_next] - d_a - distances[c, c_next]
+                if delta < -1e-10:
+                    if step == 1:
+                        _reverse(tour, position, position[a_next], position[c])
+                    else:
+                        _reverse(tour, position, position[a], position[c_next])
+                    for city in (a, a_next, c, c_next):
+                        if not active[city]:
+                            active[city] = True
+                            queue.append(city)
+                    improved = True
+                    break
+            if improved:
+                break
+
+    return tour
+
+def or_opt(path, distances: np.ndarray, neighbors: np.ndarray, max_segment: int = 3) -> list:
+    """
+    Or-opt: перенос участков из 1..max_segment городов (в прямом или обратном
+    порядке) между городом-соседом и его последователем
+    """
+    tour = [int(city) for city in path]
+    n = len(tour)
+    if n < 5:
+        return tour
+    neighbor_lists = [[int(c) for c in row] for row in neighbors]
+    position = [0] * n
+    for index, city in enumerate(tour):
+        position[city] = index
+
+    improved = True
+    while improved:
+        improved = False
+        for length in range(1, max_segment + 1):
+            i = 0
+            while i < n:
+                segment = [tour[(i + k) % n] for k in range(length)]
+                in_segment = set(segment)
+                first, last = segment[0], segment[-1]
+                prev_city = tour[(i - 1) % n]
+                next_city = tour[(i + length) % n]
+                removal_gain = (distances[prev_city, first] + distances[last, next_city]
+                                - distances[prev_city, next_city])
+
+                best = None
+                for c in neighbor_lists[first] + neighbor_lists[last]:
+                    if c in in_segment:
+                        continue
+                    c_next = tour[(position[c] + 1) % n]
+                    if c_next in in_segment:
+                        continue
+                    base = distances[c, c_next]
+                    # Вставка в прямом и в обратном порядке
+                    forward = distances[c, first] + distances[last, c_next] - base
+                    backward = distances[c, last] + distances[first, c_next] - base
+                    cost, reverse = (forward, False) if forward <= backward else (backward, True)
+                    if cost - removal_gain < -1e-10 and (best is None or cost < best[0]):
+                        best = (cost, c, reverse)
+
+                if best is not None:
+                    _, c, reverse = best
+                    rest = [city for city in tour if city not in in_segment]
+                    insert_at = rest.index(c) + 1
+                    tour = rest[:insert_at] + (segment[::-1] if reverse else segment) + rest[insert_at:]
+                    for index, city in enumerate(tour):
+                        position[city] = index
+                    improved = True
+                i += 1
+
+    return tour
+
+def two_opt_or_opt(path, distances: np.ndarray, neighbors: np.ndarray) -> list:
+    """2-opt, затем Or-opt, затем повторный 2-opt для новых ребер"""
+    tour = two_opt(path, distances, neighbors)
+    improved = or_opt(tour, distances, neighbors)
+    if improved != tour:
+        improved = two_opt(improved, distances, neighbors)
+    return improved
+
+# Встроенные процедуры локального поиска по имени
+LOCAL_SEARCH_METHODS = {
+    '2-opt': two_opt,
+    'or-opt': or_opt,
+    '2-opt+or-opt': two_opt_or_opt
+}
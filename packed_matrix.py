@@ -0,0 +1,176 @@
+"""
+Компактное хранение симметричных матриц
+
+PackedSymmetricMatrix хранит только верхний треугольник без диагонали
+(n * (n - 1) / 2 значений) в одномерном массиве values. Индексация повторяет
+плотную матрицу: m[i, j], m[i], m[rows] (строки), m[start:stop] и выборки пар
+m[rows, columns]; запись m[rows, columns] = ... меняет оба симметричных элемента
+сразу. Поэлементные операции (испарение, ограничение значений, вычисление
+привлекательности) выполняются над values напрямую.
+"""
+import numpy as np
+
+def triangle_size(n: int) -> int:
+    """Количество элементов верхнего треугольника без диагонали"""
+    return n * (n - 1) // 2
+
+def row_offset(i, n: int):
+    """Позиция элемента (i, i + 1) в упакованном массиве"""
+    i = np.asarray(i, dtype=np.int64)
+    return i * n - i * (i + 1) // 2
+
+def triangle_index(i, j, n: int):
+    """
+    Позиции элементов (i, j) в упакованном массиве (с вещанием). Для i == j
+    возвращается 0: вызывающий код сам подставляет значение диагонали
+    """
+    i = np.asarray(i, dtype=np.int64)
+    j = np.asarray(j, dtype=np.int64)
+    low = np.minimum(i, j)
+    high = np.maximum(i, j)
+    return np.where(low == high, 0, row_offset(low, n) + high - low - 1)
+
+def storage_values(matrix):
+    """
+    Массив для поэлементных операций: сама плотная матрица или values
+    упакованной матрицы (PackedSymmetricMatrix) и матрицы кандидатов (CandidateMatrix)
+    """
+    return matrix if isinstance(matrix, np.ndarray) else matrix.values
+
+class PackedSymmetricMatrix:
+    def __init__(self, values: np.ndarray, n: int, diagonal: float = 0.0):
+        """
+        Симметричная матрица n x n в упакованном виде
+
+        Args:
+            values: верхний треугольник без диагонали по строкам, длина n * (n - 1) / 2
+            n: размер матрицы
+            diagonal: значение, возвращаемое для элементов диагонали
+        """
+        if len(values) != triangle_size(n):
+            raise ValueError(f"Для матрицы {n}x{n} нужно {triangle_size(n)} значений, получено {len(values)}")
+        self.values = values
+        self.n = n
+        self.diagonal = diagonal
+
+    @classmethod
+    def full(cls, n: int, value: float, dtype=np.float64):
+        return cls(np.full(triangle_size(n), value, dtype=dtype), n)
+
+    @classmethod
+    def empty(cls, n: int, dtype=np.float64):
+        return cls(np.empty(triangle_size(n), dtype=dtype), n)
+
+    @classmethod
+    def from_rows(cls, source, dtype=np.float64, transform=None, block_size: int = 256):
+        """
+        Упаковка симметричной матрицы, читаемой блоками строк source[start:stop]
+        (плотный массив, отображенный в память файл или CoordinateDistances)
+
+        Args:
+            transform: функция, применяемая к блоку строк перед упаковкой
+        """
+        return cls.empty(len(source), dtype).set_rows(source, transform, block_size)
+
+    def set_rows(self, source, transform=None, block_size: int = 256):
+        """Запись верхнего треугольника из блоков строк source[start:stop] (см. from_rows)"""
+        n = self.n
+        for start in range(0, n, block_size):
+            rows = np.asarray(source[start:start + block_size], dtype=float)
+            if transform is not None:
+                rows = transform(rows)
+            for offset, row in enumerate(rows):
+                i = start + offset
+                begin = row_offset(i, n)
+                self.values[begin:begin + n - i - 1] = row[i + 1:]
+        return self
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def copy(self):
+        return PackedSymmetricMatrix(self.values.copy(), self.n, self.diagonal)
+
+    def fill(self, value: float):
+        self.values.fill(value)
+
+    def rows(self, rows) -> np.ndarray:
+        """Плотные строки rows (массив номеров городов), форма (len(rows), n)"""
+        rows = np.asarray(rows)
+        columns = np.arange(self.n)
+        result = self.values[triangle_index(rows[:, None], columns, self.n)]
+        result[columns == rows[:, None]] = self.diagonal
+        return result
+
+    def pairs(self, rows, columns) -> np.ndarray:
+        """Элементы (rows[i], columns[i]) для массивов любой формы"""
+        rows, columns = np.broadcast_arrays(np.asarray(rows), np.asarray(columns))
+        result = self.values[triangle_index(rows, columns, self.n)]
+        result[rows == columns] = self.diagonal
+        return result
+
+    def add_at(self, rows, columns, amounts):
+        """Добавление amounts к ребрам (rows[i], columns[i]); повторяющиеся ребра суммируются"""
+        rows, columns, amounts = np.broadcast_arrays(np.asarray(rows), np.asarray(columns), np.asarray(amounts))
+        edges = rows != columns
+        np.add.at(self.values, triangle_index(rows[edges], columns[edges], self.n), amounts[edges])
+
+    def remapped(self, city_map, fill_value: float = 0.0):
+        """
+        Матрица в новой нумерации городов: city_map[i] - прежний номер города i
+        или -1 для нового города (его элементы равны fill_value)
+        """
+        city_map = np.asarray(city_map, dtype=np.intp)
+        n = len(city_map)
+        result = PackedSymmetricMatrix.full(n, fill_value, self.dtype)
+        result.diagonal = self.diagonal
+        known = np.flatnonzero(city_map >= 0)
+        # Строка за строкой: сохраненные элементы правее диагонали
+        for position, i in enumerate(known[:-1]):
+            later = known[position + 1:]
+            result.values[triangle_index(i, later, n)] = self.pairs(city_map[i], city_map[later])
+        return result
+
+    def to_dense(self) -> np.ndarray:
+        return self.rows(np.arange(self.n))
+
+    def __array__(self, dtype=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, columns = key
+            if isinstance(rows, slice) or isinstance(columns, slice):
+                return self[rows][..., columns]
+            if np.ndim(rows) == 0 and np.ndim(columns) == 0:
+                # Одиночный элемент (локальный поиск) - без операций над массивами
+                i, j = sorted((int(rows), int(columns)))
+                if i == j:
+                    return self.diagonal
+                return self.values[i * self.n - i * (i + 1) // 2 + j - i - 1]
+            return self.pairs(rows, columns)
+        if isinstance(key, slice):
+            return self.rows(np.arange(self.n)[key])
+        if np.ndim(key) == 0:
+            return self.rows(np.array([key]))[0]
+        return self.rows(key)
+
+    def __setitem__(self, key, value):
+        rows, columns = key
+        rows, columns, value = np.broadcast_arrays(np.asarray(rows), np.asarray(columns), np.asarray(value))
+        # Элементы диагонали не хранятся
+        edges = rows != columns
+        self.values[triangle_index(rows[edges], columns[edges], self.n)] = value[edges]
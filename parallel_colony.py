@@ -0,0 +1,116 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from ant_colony_tsp import AntColonyTSP, ant_random_numbers, build_tours
+
+# Разделяемые массивы, подключенные в процессе-работнике
+_worker_arrays = {}
+
+def _attach_shared(name: str, shape: tuple, dtype: str) -> np.ndarray:
+    """Подключение к блоку разделяемой памяти как к массиву NumPy"""
+    shm = shared_memory.SharedMemory(name=name)
+    # Держим ссылку на блок, иначе он будет закрыт вместе с объектом
+    _worker_arrays.setdefault('_blocks', []).append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _init_worker(choice_info_spec: tuple, candidates_spec: tuple, backend: str):
+    """Инициализация процесса-работника: подключение к общим матрицам"""
+    choice_info = _attach_shared(*choice_info_spec)
+    _worker_arrays['choice_info'] = choice_info
+    _worker_arrays['candidates'] = _attach_shared(*candidates_spec) if candidates_spec else None
+    _worker_arrays['build_tours'] = build_tours
+    if backend == 'numba':
+        import aco_kernels
+        # Потоки Numba в процессах пула не используются
+        _worker_arrays['build_tours'] = aco_kernels.build_tours_serial
+        if _worker_arrays['candidates'] is None:
+            _worker_arrays['candidates'] = np.empty((len(choice_info), 0), dtype=np.intp)
+
+def _construct_chunk(seeds: np.ndarray) -> np.ndarray:
+    """Построение маршрутов группой муравьев в процессе-работнике"""
+    choice_info = _worker_arrays['choice_info']
+    starts, uniforms, _ = ant_random_numbers(seeds, len(choice_info))
+    return _worker_arrays['build_tours'](choice_info, _worker_arrays['candidates'], starts, uniforms)
+
+class ParallelAntColonyTSP(AntColonyTSP):
+    def __init__(self, *args, workers: int = None, **kwargs):
+        """
+        Алгоритм муравьиной колонии с построением маршрутов в пуле процессов
+
+        Муравьи итерации делятся на группы по числу процессов. Матрица
+        привлекательности переходов (производная от феромонов) и списки кандидатов
+        лежат в разделяемой памяти: процессы читают их напрямую, а по каналу
+        передаются только зерна муравьев и готовые маршруты. Расстояния и
+        обновление феромонов остаются в главном процессе.
+        При одинаковом seed результат совпадает с AntColonyTSP.
+
+        Args:
+            *args, **kwargs: параметры AntColonyTSP
+            workers: количество процессов (по умолчанию - число ядер)
+        """
+        self._pool = None
+        self._shared_blocks = []
+        super().__init__(*args, **kwargs)
+        if self.construction != 'vectorized':
+            raise ValueError("Параллельный режим поддерживает только пакетное построение маршрутов")
+        if self.storage != 'dense':
+            raise ValueError("Параллельный режим поддерживает только плотное хранение матриц")
+        if self.strategy == 'acs':
+            # Локальное обновление ACS меняет феромоны после каждого шага всех муравьев
+            raise ValueError("Параллельный режим не поддерживает стратегию ACS")
+        self.workers = workers or os.cpu_count() or 1
+
+    def _share(self, array: np.ndarray) -> tuple:
+        """Копирование массива в разделяемую память"""
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._shared_blocks.append(shm)
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared[...] = array
+        return shared, (shm.name, array.shape, array.dtype.str)
+
+    def _update_choice_info(self):
+        """Пересчет кэша привлекательности на месте, чтобы его видели процессы"""
+        if self._pool is None:
+            super()._update_choice_info()
+        else:
+            self._fill_choice_info(self.choice_info)
+
+    def _construct_solutions(self) -> np.ndarray:
+        """Построение маршрутов группами муравьев в пуле процессов"""
+        chunks = [chunk for chunk in np.array_split(self._draw_ant_seeds(), self.workers) if len(chunk)]
+        return np.concatenate(list(self._pool.map(_construct_chunk, chunks)))
+
+    def iterate(self, stop_flag=None):
+        """
+        Решение задачи коммивояжера в пуле процессов (см. AntColonyTSP.iterate);
+        пул работает, пока генератор не завершен или не закрыт
+        """
+        self.choice_info, choice_info_spec = self._share(self.choice_info)
+        candidates_spec = None
+        if self.candidates is not None:
+            self.candidates, candidates_spec = self._share(self.candidates)
+
+        # Процессы запускаются заново, а не через fork: если в этом процессе уже
+        # работал пул потоков Numba (backend='numba' в любом решателе), после fork
+        # интерпретатор зависает при завершении
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(choice_info_spec, candidates_spec, self.backend)
+        )
+        try:
+            yield from super().iterate(stop_flag)
+        finally:
+            self._pool.shutdown()
+            self._pool = None
+            # Возвращаем обычные массивы и освобождаем разделяемую память
+            self.choice_info = np.array(self.choice_info)
+            if self.candidates is not None:
+                self.candidates = np.array(self.candidates)
+            for shm in self._shared_blocks:
+                shm.close()
+                shm.unlink()
+            self._shared_blocks = []
@@ -0,0 +1,113 @@
+"""
+Профилирование решателя по фазам итерации
+
+SolverProfile накапливает время фаз итерации (построение маршрутов, оценка
+длин, локальный поиск, обновление феромонов, функция обратного вызова,
+проверка критериев остановки, копирование контрольной точки) и счетчики
+(выбранные переходы, оцененные маршруты, улучшения лучшего маршрута). Время
+фазы считается без вложенных фаз: оценка длин внутри построения маршрутов
+относится к оценке.
+
+После каждой итерации профиль передает запись в hook (если задан):
+словарь с номером итерации, временем фаз и счетчиками этой итерации.
+JsonLinesProfileLog записывает такие записи в файл по одной строке JSON.
+"""
+import json
+import time
+from contextlib import contextmanager
+
+# Фазы итерации в порядке выполнения
+PHASES = ('construction', 'evaluation', 'local_search', 'pheromone_update', 'callback', 'stop_criteria', 'checkpoint')
+
+# Счетчики событий
+COUNTERS = ('transitions', 'tours_evaluated', 'improvements')
+
+class SolverProfile:
+    def __init__(self, hook=None):
+        """
+        Время фаз и счетчики решателя
+
+        Args:
+            hook: функция f(record), вызываемая после каждой итерации
+        """
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        """Обнуление накопленных значений (в начале решения)"""
+        self.iterations = 0
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.last_record = None
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замер времени фазы; время вложенных фаз вычитается из объемлющей"""
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._phases[name] += elapsed
+            if self._stack:
+                self._phases[self._stack[-1]] -= elapsed
+
+    def count(self, name: str, value: int = 1):
+        self._counters[name] += value
+
+    def end_iteration(self, iteration: int) -> dict:
+        """Завершение итерации: перенос значений в итоги и вызов hook"""
+        record = {
+            'iteration': iteration,
+            'phases': self._phases,
+            'counters': self._counters
+        }
+        for name, elapsed in self._phases.items():
+            self.totals[name] += elapsed
+        for name, value in self._counters.items():
+            self.counters[name] += value
+        self.iterations += 1
+        self.last_record = record
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        if self.hook is not None:
+            self.hook(record)
+        return record
+
+    def summary(self) -> dict:
+        """Итоги решения: суммарное и среднее на итерацию время фаз, счетчики"""
+        iterations = max(self.iterations, 1)
+        return {
+            'iterations': self.iterations,
+            'phases': dict(self.totals),
+            'phases_per_iteration': {name: total / iterations for name, total in self.totals.items()},
+            'counters': dict(self.counters)
+        }
+
+class JsonLinesProfileLog:
+    def __init__(self, filename: str):
+        """
+        Запись профиля итераций в файл JSON Lines (hook для SolverProfile)
+
+        Args:
+            filename: путь к файлу; записи дописываются в конец
+        """
+        self.file = open(filename, 'a', encoding='utf-8')
+
+    def __call__(self, record: dict):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,100 @@
+"""
+Чтение входных данных задачи коммивояжера
+
+Модуль не зависит от графического интерфейса и используется как окном
+визуализации, так и консольным решателем.
+
+Матрица расстояний читается сразу в массив NumPy (без промежуточного
+списка списков) из одного из форматов:
+    .txt и другие текстовые - числа, разделенные пробелами, по строке на город
+    .npy - массив NumPy (большие файлы открываются отображением в память)
+    .npz - архив NumPy с массивом 'distances' (или единственным массивом)
+    .f32 - сырые числа float32 по строкам без заголовка, открываются
+           отображением в память; размер матрицы определяется по размеру файла
+    .tsp - задача в формате TSPLIB (см. tsplib.py)
+
+Задачу можно задать и координатами городов (load_coordinates), тогда
+матрица расстояний не строится (см. coordinates.CoordinateDistances).
+"""
+import os
+import numpy as np
+from tsplib import read_tsplib
+
+# Файлы .npy крупнее этого размера открываются отображением в память
+MMAP_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+def load_distances(filename, mmap: bool = None) -> np.ndarray:
+    """
+    Загрузка квадратной матрицы расстояний
+
+    Args:
+        filename: путь к файлу (формат определяется по расширению)
+        mmap: открывать ли двоичные файлы отображением в память без чтения
+            в ОЗУ; None - только большие .npy и всегда для .f32
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.npy':
+        if mmap is None:
+            mmap = os.path.getsize(filename) > MMAP_THRESHOLD_BYTES
+        distances = np.load(filename, mmap_mode='r' if mmap else None)
+    elif extension == '.npz':
+        with np.load(filename) as archive:
+            if 'distances' in archive.files:
+                distances = archive['distances']
+            elif len(archive.files) == 1:
+                distances = archive[archive.files[0]]
+            else:
+                raise ValueError(f"В архиве {filename} нет массива 'distances'")
+    elif extension == '.tsp':
+        distances = read_tsplib(filename).distances
+    elif extension == '.f32':
+        size = os.path.getsize(filename) // 4
+        n_cities = int(round(size ** 0.5))
+        if n_cities * n_cities != size:
+            raise ValueError(f"Размер файла {filename} не соответствует квадратной матрице float32")
+        distances = np.memmap(filename, dtype=np.float32, mode='r', shape=(n_cities, n_cities))
+        if mmap is False:
+            distances = np.array(distances)
+    else:
+        distances = np.loadtxt(filename, dtype=float, ndmin=2)
+
+    if distances.ndim != 2 or distances.shape[0] != distances.shape[1]:
+        raise ValueError(f"Матрица расстояний должна быть квадратной, получена форма {distances.shape}")
+    return distances
+
+def save_distances(filename, distances):
+    """Сохранение матрицы расстояний в формате, определяемом по расширению"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.npy':
+        np.save(filename, np.asarray(distances))
+    elif extension == '.npz':
+        np.savez(filename, distances=np.asarray(distances))
+    elif extension == '.f32':
+        np.asarray(distances, dtype=np.float32).tofile(filename)
+    else:
+        np.savetxt(filename, np.asarray(distances), fmt='%.17g')
+
+def load_coordinates(filename) -> np.ndarray:
+    """
+    Загрузка координат городов формы (n_cities, 2): текст (по городу
+    в строке, два числа через пробел) или .npy
+    """
+    if os.path.splitext(filename)[1].lower() == '.npy':
+        coordinates = np.load(filename)
+    else:
+        coordinates = np.loadtxt(filename, dtype=float, ndmin=2)
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+        raise ValueError(f"Координаты должны иметь форму (n, 2), получена форма {coordinates.shape}")
+    return coordinates
+
+def read_distances(filename):
+    """Чтение матрицы расстояний (любой поддерживаемый формат)"""
+    return load_distances(filename)
+
+def read_parameters(filename):
+    parameters = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            key, value = line.strip().split('=')
+            parameters[key] = float(value)
+    return parameters
@@ -0,0 +1,187 @@
+"""
+Чтение задач и маршрутов в формате TSPLIB
+
+Поддерживаются симметричные задачи (TYPE: TSP) с типами весов EUC_2D,
+CEIL_2D, ATT, GEO и EXPLICIT (форматы FULL_MATRIX, UPPER_ROW, LOWER_ROW,
+UPPER_DIAG_ROW, LOWER_DIAG_ROW и соответствующие *_COL), а также
+файлы маршрутов .opt.tour. Расстояния вычисляются по правилам TSPLIB
+(с округлением до целых), поэтому длины маршрутов сравнимы с известными
+оптимумами. Номера городов в TSPLIB начинаются с 1, здесь - с 0.
+"""
+from typing import List, NamedTuple
+import numpy as np
+from coordinates import CoordinateDistances
+
+# Константы TSPLIB для географических координат
+GEO_PI = 3.141592
+GEO_EARTH_RADIUS = 6378.388
+
+def euc_2d(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """EUC_2D: евклидово расстояние, округленное до ближайшего целого"""
+    return np.floor(np.sqrt(((a - b) ** 2).sum(axis=-1)) + 0.5)
+
+def ceil_2d(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """CEIL_2D: евклидово расстояние, округленное вверх"""
+    return np.ceil(np.sqrt(((a - b) ** 2).sum(axis=-1)))
+
+def att(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """ATT: псевдоевклидово расстояние задач att48 и att532"""
+    r = np.sqrt(((a - b) ** 2).sum(axis=-1) / 10.0)
+    t = np.floor(r + 0.5)
+    return np.where(t < r, t + 1, t)
+
+def _geo_radians(values: np.ndarray) -> np.ndarray:
+    """Перевод координат TSPLIB в формате ГГГ.ММ (градусы и минуты) в радианы"""
+    degrees = np.trunc(values)
+    minutes = values - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+def geo(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """GEO: расстояние по поверхности Земли в км по правилам TSPLIB"""
+    lat_a, lon_a = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+    lat_b, lon_b = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+    q1 = np.cos(lon_a - lon_b)
+    q2 = np.cos(lat_a - lat_b)
+    q3 = np.cos(lat_a + lat_b)
+    cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    return np.trunc(GEO_EARTH_RADIUS * np.arccos(cosine) + 1.0)
+
+# Метрики для задач, заданных координатами
+EDGE_WEIGHT_METRICS = {
+    'EUC_2D': euc_2d,
+    'CEIL_2D': ceil_2d,
+    'ATT': att,
+    'GEO': geo
+}
+
+# Столбцовые форматы симметричной матрицы совпадают со строковыми форматами другого треугольника
+_COLUMN_FORMATS = {
+    'UPPER_COL': 'LOWER_ROW',
+    'LOWER_COL': 'UPPER_ROW',
+    'UPPER_DIAG_COL': 'LOWER_DIAG_ROW',
+    'LOWER_DIAG_COL': 'UPPER_DIAG_ROW'
+}
+
+# Ключи заголовка, которые могут встретиться и после секций данных
+_HEADER_KEYS = {
+    'NAME', 'TYPE', 'COMMENT', 'DIMENSION', 'CAPACITY', 'EDGE_WEIGHT_TYPE',
+    'EDGE_WEIGHT_FORMAT', 'EDGE_DATA_FORMAT', 'NODE_COORD_TYPE', 'DISPLAY_DATA_TYPE'
+}
+
+class TSPLIBProblem(NamedTuple):
+    name: str
+    comment: str
+    dimension: int
+    edge_weight_type: str
+    # Координаты городов (n, 2) или None для EXPLICIT
+    coordinates: np.ndarray
+    # Матрица расстояний или CoordinateDistances
+    distances: object
+
+def _parse(filename: str):
+    """Заголовок (словарь ключ -> значение) и секции (имя -> список строк данных)"""
+    header = {}
+    sections = {}
+    current = None
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line == 'EOF':
+                continue
+            keyword = line.split()[0].split(':')[0].upper()
+            if keyword.endswith('_SECTION'):
+                current = keyword
+                sections[current] = []
+            elif ':' in line and (current is None or keyword in _HEADER_KEYS):
+                key, value = line.split(':', 1)
+                header[key.strip().upper()] = value.strip()
+            elif current is None:
+                raise ValueError(f"Неожиданная строка в заголовке {filename}: {line}")
+            else:
+                sections[current].append(line)
+    return header, sections
+
+def _explicit_matrix(values: np.ndarray, dimension: int, weight_format: str) -> np.ndarray:
+    """Симметричная матрица из списка весов EDGE_WEIGHT_SECTION"""
+    weight_format = _COLUMN_FORMATS.get(weight_format, weight_format)
+    if weight_format == 'FULL_MATRIX':
+        return values[:dimension * dimension].reshape(dimension, dimension).copy()
+
+    matrix = np.zeros((dimension, dimension))
+    if weight_format == 'UPPER_ROW':
+        rows, columns = np.triu_indices(dimension, 1)
+    elif weight_format == 'LOWER_ROW':
+        rows, columns = np.tril_indices(dimension, -1)
+    elif weight_format == 'UPPER_DIAG_ROW':
+        rows, columns = np.triu_indices(dimension)
+    elif weight_format == 'LOWER_DIAG_ROW':
+        rows, columns = np.tril_indices(dimension)
+    else:
+        raise ValueError(f"Неподдерживаемый формат весов: {weight_format}")
+    if len(values) < len(rows):
+        raise ValueError(f"В EDGE_WEIGHT_SECTION {len(values)} чисел вместо {len(rows)}")
+    # Индексы numpy перечисляют треугольник по строкам - в порядке TSPLIB
+    matrix[rows, columns] = values[:len(rows)]
+    matrix[columns, rows] = values[:len(rows)]
+    return matrix
+
+def read_tsplib(filename: str, dense: bool = True) -> TSPLIBProblem:
+    """
+    Чтение задачи TSPLIB (.tsp)
+
+    Args:
+        filename: путь к файлу
+        dense: для задач с координатами - построить полную матрицу расстояний
+            (False - вернуть CoordinateDistances, расстояния вычисляются по запросу)
+    """
+    header, sections = _parse(filename)
+    problem_type = header.get('TYPE', 'TSP').split()[0]
+    if problem_type != 'TSP':
+        raise ValueError(f"Поддерживаются только симметричные задачи TSP, получено {problem_type}")
+    dimension = int(header['DIMENSION'])
+    edge_weight_type = header.get('EDGE_WEIGHT_TYPE', '').upper()
+
+    coordinates = None
+    if 'NODE_COORD_SECTION' in sections:
+        data = np.array([line.split() for line in sections['NODE_COORD_SECTION']], dtype=float)
+        if data.shape != (dimension, 3):
+            raise ValueError(f"NODE_COORD_SECTION должна содержать {dimension} строк 'номер x y'")
+        coordinates = np.empty((dimension, 2))
+        coordinates[data[:, 0].astype(int) - 1] = data[:, 1:]
+
+    if edge_weight_type == 'EXPLICIT':
+        values = np.array(' '.join(sections.get('EDGE_WEIGHT_SECTION', [])).split(), dtype=float)
+        distances = _explicit_matrix(values, dimension, header.get('EDGE_WEIGHT_FORMAT', '').upper())
+    elif edge_weight_type in EDGE_WEIGHT_METRICS:
+        if coordinates is None:
+            raise ValueError(f"Для типа {edge_weight_type} нужна NODE_COORD_SECTION")
+        distances = CoordinateDistances(coordinates, EDGE_WEIGHT_METRICS[edge_weight_type])
+        if dense:
+            distances = distances.to_matrix()
+    else:
+        raise ValueError(f"Неподдерживаемый тип весов: {edge_weight_type}")
+
+    return TSPLIBProblem(
+        name=header.get('NAME', ''),
+        comment=header.get('COMMENT', ''),
+        dimension=dimension,
+        edge_weight_type=edge_weight_type,
+        coordinates=coordinates,
+        distances=distances
+    )
+
+def read_tour(filename: str) -> List[int]:
+    """Чтение маршрута TSPLIB (.tour, .opt.tour): номера городов с 0"""
+    _, sections = _parse(filename)
+    tour = []
+    for line in sections.get('TOUR_SECTION', []):
+        for value in line.split():
+            if int(value) == -1:
+                return tour
+            tour.append(int(value) - 1)
+    return tour
+
+def tour_length(tour: List[int], distances) -> float:
+    """Длина замкнутого маршрута"""
+    tour = np.asarray(tour, dtype=np.intp)
+    return float(np.sum(distances[tour, np.roll(tour, -1)]))
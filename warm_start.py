@@ -0,0 +1,63 @@
+"""
+Теплый старт решателя по результатам предыдущего решения
+
+Когда задача немного изменилась (добавлены или удалены города), феромоны и
+лучший маршрут прошлого решения переносятся на новую нумерацию городов
+через city_map: city_map[i] - номер города i новой задачи в старой задаче
+или -1, если город новый. Новые города получают начальный уровень феромона
+и вставляются в маршрут по принципу наименьшего удлинения.
+"""
+import numpy as np
+from packed_matrix import PackedSymmetricMatrix
+
+def _check_city_map(city_map) -> np.ndarray:
+    city_map = np.asarray(city_map, dtype=np.intp)
+    known = city_map[city_map >= 0]
+    if len(np.unique(known)) != len(known):
+        raise ValueError("В city_map один старый город сопоставлен нескольким новым")
+    return city_map
+
+def remap_pheromone(pheromone, city_map, fill_value: float) -> np.ndarray:
+    """
+    Матрица феромонов в нумерации новой задачи
+
+    Args:
+        pheromone: матрица феромонов старой задачи (плотная или PackedSymmetricMatrix)
+        city_map: номера городов новой задачи в старой (-1 - новый город)
+        fill_value: уровень феромона на ребрах новых городов
+    """
+    city_map = _check_city_map(city_map)
+    result = np.full((len(city_map), len(city_map)), fill_value, dtype=float)
+    known = np.flatnonzero(city_map >= 0)
+    old = city_map[known]
+    result[np.ix_(known, known)] = pheromone[np.ix_(old, old)]
+    return result
+
+def remap_tour(tour, city_map, distances) -> list:
+    """
+    Маршрут старой задачи в нумерации новой: удаленные города пропускаются,
+    недостающие вставляются туда, где маршрут удлиняется меньше всего
+    """
+    city_map = _check_city_map(city_map)
+    new_index = {int(old): new for new, old in enumerate(city_map) if old >= 0}
+    path = [new_index[int(city)] for city in tour if int(city) in new_index]
+    missing = sorted(set(range(len(city_map))) - set(path))
+    if not path:
+        path = [missing.pop(0)]
+    for city in missing:
+        cities = np.asarray(path, dtype=np.intp)
+        following = np.roll(cities, -1)
+        growth = distances[cities, city] + distances[city, following] - distances[cities, following]
+        path.insert(int(np.argmin(growth)) + 1, city)
+    return path
+
+def checkpoint_pheromone(checkpoint: dict):
+    """Матрица феромонов из контрольной точки (см. checkpoint.load_checkpoint)"""
+    pheromone = checkpoint['pheromone']
+    if checkpoint['metadata']['parameters']['storage'] == 'candidates':
+        # Сохранены только значения по спискам кандидатов, самих списков в точке нет
+        raise ValueError("Феромоны хранения 'candidates' продолжаются только через resume_from")
+    if pheromone.ndim == 1:
+        # Упакованное хранение: сохранен только верхний треугольник
+        return PackedSymmetricMatrix(pheromone, checkpoint['metadata']['parameters']['n_cities'])
+    return pheromone